@@ -0,0 +1,101 @@
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from yamlang.pattern import DictPattern as Dict
+from yamlang.pattern import IntPattern as Int
+from yamlang.pattern import ListPattern as List
+from yamlang.pattern import StrPattern as Str
+from yamlang.pattern import parallel
+from yamlang.pattern import pattern
+from yamlang.pattern.parallel import Match
+from yamlang.yamltools import Document
+from yamlang.yamltools import load_stream
+
+
+class Item(Dict):
+    name = Str()
+    size = Int() | None
+    tags = List(Str())
+
+
+def documents(n: int) -> list[Document]:
+    return [
+        {"name": str(i), "size": i, "tags": ["a", "b"][: i % 3]}
+        if i % 5
+        else {"name": i}
+        for i in range(n)
+    ]
+
+
+def test_apply_many_serial() -> None:
+    batch = documents(100)
+    expected = [(i, tuple(Item().apply(d))) for i, d in enumerate(batch)]
+
+    assert list(Item().apply_many(batch)) == expected
+    assert list(Item().apply_many(iter(batch), chunksize=7)) == expected
+    assert list(Item().apply_many([])) == []
+
+
+def test_apply_many_workers() -> None:
+    batch = documents(1000)
+    expected = [(i, tuple(Item().apply(d))) for i, d in enumerate(batch)]
+
+    assert (
+        list(Item().apply_many(iter(batch), workers=2, chunksize=64))
+        == expected
+    )
+    assert (
+        sorted(
+            Item().apply_many(batch, workers=3, chunksize=10, ordered=False),
+        )
+        == expected
+    )
+
+
+def test_parallel_list_pattern() -> None:
+    batch = documents(500)
+    serial = List(Item())
+    parallel = List(Item(), workers=2, threshold=100)
+
+    assert tuple(parallel.apply(batch)) == tuple(serial.apply(batch))
+    assert tuple(parallel.apply(batch[:50])) == tuple(serial.apply(batch[:50]))
+    assert tuple(parallel.apply(batch + [1])) == ()
+
+    serial = List(Int() | Str() | Int())
+    parallel = List(Int() | Str() | Int(), workers=2, threshold=2)
+    batch = [1, "2", [3, "4"], 5]
+
+    assert tuple(parallel.apply(batch)) == tuple(serial.apply(batch))
+    assert tuple(parallel.compile()(batch)) == tuple(serial.apply(batch))
+
+
+def test_parallel_list_pattern_pools(monkeypatch: pytest.MonkeyPatch) -> None:
+    pools: list[int] = []
+    apply_many = parallel.apply_many
+
+    def counted_apply_many(*args: Any) -> Iterator[Match]:
+        pools.append(1)
+        return apply_many(*args)
+
+    monkeypatch.setattr(pattern, "apply_many", counted_apply_many)
+
+    # The second item has two results, so the list has two matches.
+    assert tuple(List(Int(), workers=2, threshold=2).apply([1, [2, 3]])) == (
+        [1, 2],
+        [1, 3],
+    )
+    assert len(pools) == 1
+
+
+def test_apply_stream() -> None:
+    batch = documents(100)
+    expected = [result for d in batch for result in Item().apply(d)]
+
+    assert list(Item().apply_stream(iter(batch))) == expected
+    assert list(Item().apply_stream(load_stream("a\n---\n[1, 2]\n"))) == []
+    assert list(List(Int()).apply_stream(load_stream("[1]\n---\n[2]"))) == [
+        [1],
+        [2],
+    ]
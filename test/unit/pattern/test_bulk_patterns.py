@@ -0,0 +1,56 @@
+from yamlang.pattern import BoolPattern as Bool
+from yamlang.pattern import FloatPattern as Float
+from yamlang.pattern import IntPattern as Int
+from yamlang.pattern import ListPattern as List
+from yamlang.pattern import Pattern
+from yamlang.pattern import StrPattern as Str
+from yamlang.yamltools import Document
+
+
+def match_same(p: List, d: Document) -> bool:
+    # The item pattern alone does not match the list in bulk.
+    result = tuple(p.apply(d))
+    answer = tuple(p.compile()(d))
+    if result != answer:
+        print("actual:", result)
+        print("expected:", answer)
+    return result == answer and result == tuple(p.apply_memoized(d))
+
+
+def test_bulk_list_pattern() -> None:
+    items: list[Pattern] = [
+        Int(),
+        Int(1),
+        Float(),
+        Bool(),
+        Str(),
+        Str.one_of(["a", "b"]),
+        Str("a") | Str("a"),
+        Str.prefix("a"),
+    ]
+    documents: list[Document] = [
+        [],
+        [1, 2, 3],
+        [1, 1],
+        [1, True],
+        [1.0, 2.5],
+        [1, 2.0],
+        [True, False],
+        ["a", "b", "a"],
+        ["a", "ab"],
+        ["a", ["b", "c"]],
+        [[1, 2], 3],
+        [None],
+    ]
+
+    for item in items:
+        for document in documents:
+            assert match_same(List(item), document)
+
+
+def test_bulk_result_is_a_copy() -> None:
+    document: Document = list(range(1000))
+    (result,) = List(Int()).apply(document)
+
+    assert result == document
+    assert result is not document
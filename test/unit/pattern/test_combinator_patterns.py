@@ -0,0 +1,34 @@
+from copy import copy
+
+from yamlang.pattern import DictPattern as Dict
+from yamlang.pattern import IntPattern as Int
+from yamlang.pattern import ListPattern as List
+from yamlang.pattern import StrPattern as Str
+
+
+def test_combinator_shares_source() -> None:
+    class My(Dict):
+        a = Int()
+        b = List(Str())
+
+    source = My()
+    patterns = [
+        source[0],
+        source["a"],
+        source[None],  # type: ignore
+        source | Int(),
+        source | None,
+        source << dict,
+        source >> dict,
+    ]
+
+    for pattern in patterns:
+        assert not hasattr(pattern, "__dict__")
+        assert repr(pattern) == repr(source)
+        assert repr(copy(pattern)) == repr(pattern)
+
+    assert not hasattr(source.a, "__dict__")
+    assert repr(source.a) == repr(Int())
+
+    assert tuple((source | None).a.apply({"a": 1, "b": []})) == (1,)
+    assert tuple((source << dict).b[0].apply({"a": 1, "b": ["c"]})) == ("c",)
@@ -0,0 +1,131 @@
+from yamlang.pattern import BoolPattern as Bool
+from yamlang.pattern import DictPattern as Dict
+from yamlang.pattern import FloatPattern as Float
+from yamlang.pattern import IntPattern as Int
+from yamlang.pattern import ListPattern as List
+from yamlang.pattern import Pattern
+from yamlang.pattern import StrPattern as Str
+from yamlang.yamltools import Document
+from yamlang.yamltools import load_from_text
+
+SENTINEL_LITERAL_STR = "__SENTINEL_LITERAL_STR__"
+
+
+def match_success(
+    p: Pattern,
+    d: Document | tuple[Document, ...],
+    r: Document | tuple[Document, ...] = SENTINEL_LITERAL_STR,
+) -> bool:
+    document = list(d) if isinstance(d, tuple) else d
+    result = tuple(p.compile()(document))
+    answer = (
+        r
+        if isinstance(r, tuple)
+        else (r,)
+        if r != SENTINEL_LITERAL_STR
+        else d
+        if isinstance(d, tuple)
+        else (d,)
+    )
+    if result != answer:
+        print("actual:", result)
+        print("expected:", answer)
+    return result == answer and result == tuple(p.apply(document))
+
+
+def match_failure(p: Pattern, d: Document | tuple[Document, ...]) -> bool:
+    return match_success(p, d, ())
+
+
+def test_compiled_scalar_pattern() -> None:
+    assert match_success(Bool(), True)
+    assert match_success(Int(1), 1)
+    assert match_success(Float(), 1.0)
+    assert match_success(Str("A"), "A")
+
+    assert match_failure(Int(), True)
+    assert match_failure(Int(1), 2)
+    assert match_failure(Str("A"), "B")
+
+    assert match_success(Int(), (1, "2", 3), (1, 3))
+    assert match_failure(Int(), ([1, 2],))
+
+
+def test_compiled_container_pattern() -> None:
+    assert match_success(List(Int()), [1, 2, 3])
+    assert match_success(List(Int()), [])
+    assert match_failure(List(Int()), [1, "2", 3])
+    assert match_success(
+        List(Int() | Str()),
+        [[1, "2"], 3],
+        ([1, 3], ["2", 3]),
+    )
+
+    assert match_success(Dict(), {"a": 1}, {})
+    assert match_success(
+        Dict(a=Int(), b=Str()),
+        {"a": 1, "b": "2", "c": 3},
+        {"a": 1, "b": "2"},
+    )
+    assert match_failure(Dict(a=Int(), b=Str()), {"a": 1})
+    assert match_success(
+        Dict(a=Int(), b=Str()),
+        {"a": [1, 2], "b": "3"},
+        ({"a": 1, "b": "3"}, {"a": 2, "b": "3"}),
+    )
+    assert match_success(
+        Dict(a=Int()),
+        ({"a": 1}, {"a": "2"}, {"a": 3}),
+        ({"a": 1}, {"a": 3}),
+    )
+
+
+def test_compiled_combinator_pattern() -> None:
+    assert match_success(Int() | None, "1", None)
+    assert match_success(Int() | Str(), (1, "2"), (1, "2"))
+    assert match_success(List(Int())[1], [1, 2, 3], 2)
+    assert match_success(List(Int())[-1], [1, 2, 3], 3)
+    assert match_failure(List(Int())[3], [1, 2, 3])
+    assert match_success(Dict(a=Int())["a"], {"a": 1}, 1)
+    assert match_failure(Dict(a=Int())["b"], {"a": 1})
+    assert match_failure(Dict(a=Int())[1.0], {"a": 1})  # type: ignore
+
+    assert match_success(Int() >> str, 1, "1")
+    assert match_success(Int() << int, "1", 1)
+    assert match_success(
+        Dict(a=List(Int() | Str())) << load_from_text,
+        r"{a: [1, '2']}",
+        {"a": [1, "2"]},
+    )
+
+
+def test_compiled_named_pattern() -> None:
+    class Parent(Dict):
+        class ChildA(Dict):
+            name = Str("A")
+            a = Int()
+
+        class ChildB(Dict):
+            name = Str("B")
+            a = Int()
+            b = Bool()
+
+        child = ChildA() | ChildB()
+
+    assert match_success(Parent().child.a, {"child": {"name": "A", "a": 1}}, 1)
+    assert match_success(
+        Parent().child["b"],
+        {"child": {"name": "B", "a": 1, "b": True}},
+        True,
+    )
+    assert match_failure(Parent().child["b"], {"child": {"name": "A", "a": 1}})
+
+
+def test_compiled_deep_pattern() -> None:
+    pattern: Pattern = Int()
+    document: Document = 1
+    for _ in range(32):
+        pattern = List(Dict(a=pattern))
+        document = [{"a": document}]
+
+    assert match_success(pattern, document)
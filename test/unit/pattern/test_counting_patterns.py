@@ -0,0 +1,67 @@
+from random import Random
+
+import pytest
+
+from yamlang.pattern import BoolPattern as Bool
+from yamlang.pattern import DictPattern as Dict
+from yamlang.pattern import IntPattern as Int
+from yamlang.pattern import ListPattern as List
+from yamlang.pattern import Pattern
+from yamlang.pattern import StrPattern as Str
+from yamlang.yamltools import Document
+
+
+def count_same(p: Pattern, d: Document) -> bool:
+    results = list(p.apply(d))
+    if p.count(d) != len(results):
+        print("actual:", p.count(d))
+        print("expected:", len(results))
+        return False
+
+    return all(p.nth(d, i) == result for i, result in enumerate(results))
+
+
+def test_count_and_nth() -> None:
+    assert count_same(Int(), [1, "2", 3])
+    assert count_same(List(Int() | Str()), [[1, "2"], 3, ["4", 5]])
+    assert count_same(List(Int() | Str()), [[1, "2"], None])
+    assert count_same(Dict(a=Int(), b=Str() | None), {"a": [1, 2]})
+    assert count_same(
+        Dict(a=Int(), b=Bool()),
+        [{"a": [1, 2], "b": [True, False]}, None, {"a": 3, "b": False}],
+    )
+    assert count_same(List(List(Bool()))[1], [[[True, False]], [[False]]])
+    assert count_same(Dict(a=List(Int() | Bool()))["a"][0], {"a": [[1, 2]]})
+    assert count_same((Int() << int) >> str, "1")
+
+    class My(Dict):
+        a = Int() | Str()
+        b = Bool()
+
+    assert count_same(My().a, {"a": [1, "2"], "b": [True, False]})
+
+
+def test_nth_out_of_range() -> None:
+    assert List(Bool()).nth([[True, False]], -1) == [False]
+
+    with pytest.raises(IndexError):
+        List(Bool()).nth([[True, False]], 2)
+
+    with pytest.raises(IndexError):
+        Int().nth("1", 0)
+
+
+def test_count_without_enumeration() -> None:
+    pattern = List(List(Bool()))
+    document: Document = [[[True, False]] * 10] * 10
+
+    assert pattern.count(document) == 2**100
+    assert pattern.nth(document, 0) == [[True] * 10] * 10
+    assert pattern.nth(document, -1) == [[False] * 10] * 10
+    assert pattern.nth(document, 1) == [[True] * 10] * 9 + [
+        [True] * 9 + [False],
+    ]
+
+    samples = pattern.sample(document, 3, random=Random(0))
+    assert len(samples) == 3
+    assert all(pattern.matches(sample) for sample in samples)
@@ -0,0 +1,84 @@
+from types import GeneratorType
+
+from yamlang.pattern import BoolPattern as Bool
+from yamlang.pattern import DictPattern as Dict
+from yamlang.pattern import FloatPattern as Float
+from yamlang.pattern import IntPattern as Int
+from yamlang.pattern import ListPattern as List
+from yamlang.pattern import StrPattern as Str
+from yamlang.yamltools import Document
+
+
+def test_deterministic_analysis() -> None:
+    assert Int().deterministic
+    assert List(Dict(a=Int(), b=Str() | None)).deterministic
+    assert Dict(a=List(Float()))["a"][0].deterministic
+
+    assert not (Int() | Str()).deterministic
+    assert not List(Int() | Str()).deterministic
+    assert not Dict(a=Int(), b=Bool() | Float())["a"].deterministic
+    assert not (Bool() << bool >> str).deterministic
+
+    class My(Dict):
+        a = Int()
+        b = Str() | None
+
+    class Your(Dict):
+        a = Int() | Str()
+
+    assert My().deterministic
+    assert My().b.deterministic
+    assert not Your().deterministic
+
+
+def test_deterministic_fast_path() -> None:
+    pattern = Dict(a=Int(), b=List(Str()) | None)
+
+    results = pattern.apply({"a": 1, "b": ["2", "3"]})
+    assert not isinstance(results, GeneratorType)
+    assert tuple(results) == ({"a": 1, "b": ["2", "3"]},)
+
+    assert tuple(pattern.apply({"a": 1})) == ({"a": 1, "b": None},)
+    assert tuple(pattern.apply({"a": "1"})) == ()
+    assert tuple(pattern.apply([{"a": "1"}, {"a": 2}])) == (
+        {"a": 2, "b": None},
+    )
+
+
+def test_deterministic_fallback() -> None:
+    assert tuple(Int().apply([1, 2])) == (1, 2)
+    assert tuple(Dict(a=Int()).apply({"a": [1, 2]})) == ({"a": 1}, {"a": 2})
+    assert tuple(Dict(a=Int()).apply([{"a": 1}, {"a": 2}])) == (
+        {"a": 1},
+        {"a": 2},
+    )
+    assert tuple(List(Bool()).apply([[True, False], True])) == (
+        [True, True],
+        [False, True],
+    )
+    assert tuple(List(Bool())[0].apply([[True, False]])) == (True, False)
+
+
+def test_deterministic_callbacks() -> None:
+    calls: list[Document] = []
+
+    def record(document: Document) -> Document:
+        calls.append(document)
+        return document
+
+    documents = [{"a": 1}, {"a": 2}, {"a": 3}]
+
+    assert tuple(Dict(a=Int() >> record).apply(documents)) == (
+        {"a": 1},
+        {"a": 2},
+        {"a": 3},
+    )
+    assert calls == [1, 2, 3]
+
+    calls.clear()
+    assert tuple((Dict(a=Int()) << record).apply(documents)) == (
+        {"a": 1},
+        {"a": 2},
+        {"a": 3},
+    )
+    assert calls == [documents]
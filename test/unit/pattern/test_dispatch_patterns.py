@@ -0,0 +1,81 @@
+from functools import reduce
+from operator import or_
+
+from yamlang.pattern import BoolPattern as Bool
+from yamlang.pattern import DictPattern as Dict
+from yamlang.pattern import IntPattern as Int
+from yamlang.pattern import ListPattern as List
+from yamlang.pattern import Pattern
+from yamlang.pattern import StrPattern as Str
+from yamlang.yamltools import Document
+
+
+def match_same(p: Pattern, d: Document) -> bool:
+    # Compiled matchers try every branch in turn.
+    result = tuple(p.apply(d))
+    answer = tuple(p.compile()(d))
+    if result != answer:
+        print("actual:", result)
+        print("expected:", answer)
+    return result == answer
+
+
+def test_dispatch_pattern() -> None:
+    class None_(Dict):
+        none = Str() | None
+
+    class Some(Dict):
+        some = Int()
+
+    class Pair(Dict):
+        kind = Str("pair")
+        left = Int()
+        right = Int()
+
+    class Flag(Dict):
+        kind = Str("flag") | Str("bool")
+        value = Bool()
+
+    class Any_(Dict):
+        kind = Str()
+
+    pattern = None_() | Some() | Pair() | (Flag() | Any_())
+    documents: list[Document] = [
+        {},
+        {"none": None},
+        {"some": 1},
+        {"some": [1, 2], "kind": "pair", "left": 3, "right": 4},
+        {"kind": "flag", "value": True},
+        {"kind": "bool", "value": [True, 1]},
+        {"kind": ["pair", "flag"], "left": 1, "right": 2, "value": False},
+        {"kind": {"pair": 1}, "left": 1, "right": 2},
+        {"kind": 1, "some": 2},
+        [{"some": 1}, {"kind": "pair", "left": 1, "right": 2}],
+        None,
+    ]
+
+    for document in documents:
+        assert match_same(pattern, document)
+        assert match_same(List(pattern), [document, document])
+
+
+def test_dispatch_skips_branches() -> None:
+    calls = 0
+
+    def count(x: Document) -> Document:
+        nonlocal calls
+        calls += 1
+        return x
+
+    pattern = reduce(
+        or_,
+        (Dict(value=Int() << count, kind=Str(f"{i}")) for i in range(8)),
+    )
+    document = {"kind": "3", "value": 3}
+
+    assert tuple(pattern.apply(document)) == (document,)
+    assert calls == 1
+
+    calls = 0
+    assert tuple(pattern.compile()(document)) == (document,)
+    assert calls == 8
@@ -0,0 +1,55 @@
+from yamlang.pattern import DictPattern as Dict
+from yamlang.pattern import IntPattern as Int
+from yamlang.pattern import ListPattern as List
+from yamlang.pattern import Pattern
+from yamlang.pattern import StrPattern as Str
+from yamlang.yamltools import load_stream
+
+
+def match_same(p: Pattern, text: str) -> bool:
+    result = tuple(p.apply_events(text))
+    answer = tuple(p.apply_stream(load_stream(text)))
+    if result != answer:
+        print("actual:", result)
+        print("expected:", answer)
+    return result == answer
+
+
+def test_pattern_projection() -> None:
+    class Child(Dict):
+        name = Str()
+        size = Int() | None
+
+    class Parent(Dict):
+        child = Child()
+        items = List(Int() | Str())
+
+    assert Int().projection == {}
+    assert Child().projection == {"name": {}, "size": {}}
+    assert Parent().child.projection == Parent().projection
+    assert (Parent() | Dict(other=Int() << int)).projection == {
+        "child": {"name": {}, "size": {}},
+        "items": {},
+        "other": None,
+    }
+    assert List(Child()["name"] >> str).projection == Child().projection
+
+
+def test_event_pattern() -> None:
+    class Item(Dict):
+        id = Int()
+        tags = List(Str()) | None
+
+    text = (
+        "{id: 1, body: {text: &T long, more: [1, 2]}, title: *T, tags: [a]}\n"
+        "---\n"
+        "{id: 2, tags: [c, 3]}\n"
+        "---\n"
+        "[{id: 3}, {id: four}, {id: 5, tags: [yes, null]}]\n"
+    )
+
+    assert match_same(Item(), text)
+    assert match_same(Item().tags[0], text)
+    assert match_same(Dict(title=Str()), text)
+    assert match_same(Dict(body=Dict(more=List(Int()))), text)
+    assert match_same(Dict(body=Str() << str), text)
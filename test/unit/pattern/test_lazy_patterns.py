@@ -0,0 +1,111 @@
+from itertools import product
+
+from yamlang.pattern import BoolPattern as Bool
+from yamlang.pattern import DictPattern as Dict
+from yamlang.pattern import IntPattern as Int
+from yamlang.pattern import ListPattern as List
+from yamlang.pattern import Pattern
+from yamlang.pattern import StrPattern as Str
+from yamlang.pattern.product import lazy_product
+from yamlang.yamltools import Document
+from yamlang.yamltools import load_from_text
+
+
+def match_same(p: Pattern, d: Document) -> bool:
+    result = tuple(p.apply_lazy(d))
+    answer = tuple(p.apply(d))
+    if result != answer:
+        print("actual:", result)
+        print("expected:", answer)
+    return result == answer
+
+
+def test_lazy_product() -> None:
+    for iterables in (
+        (),
+        ((),),
+        ((1, 2),),
+        ((1, 2), ()),
+        ((), (1, 2)),
+        ((1, 2), (3,), (4, 5, 6)),
+        ((1,), (2,), (3,)),
+    ):
+        assert tuple(lazy_product(*iterables)) == tuple(product(*iterables))
+
+
+def test_lazy_pattern() -> None:
+    assert match_same(List(List(Bool())), [[[True, False], [False]], [True]])
+    assert match_same(List(Int() | Str()), [[1, "2"], [3, "4"], 5])
+    assert match_same(List(Int() | Str()), [[1, "2"], [None], 5])
+    assert match_same(
+        Dict(a=Int(), b=Str() | None),
+        [{"a": [1, 2], "b": ["3", "4"]}, {"a": 5}],
+    )
+    assert match_same(Dict(a=List(Int() | Bool()))["a"][1], {"a": [1, [2, 3]]})
+
+
+def test_lazy_first_result() -> None:
+    calls = 0
+
+    def count(x: Document) -> Document:
+        nonlocal calls
+        calls += 1
+        return x
+
+    pattern = List((Int() | Int()) >> count)
+    document: Document = list(range(1000))
+
+    assert next(iter(pattern.apply_lazy(document))) == document
+    assert calls == 1000
+
+    calls = 0
+    assert next(iter(pattern.apply(document))) == document
+    assert calls == 2000
+
+
+def test_first_exists_matches() -> None:
+    assert List(Int() | Str()).first([[1, "2"], 3]) == [1, 3]
+    assert List(Int() | Str()).first([None, 3]) is None
+    assert List(Int() | Str()).first([None, 3], default=()) == ()
+    assert (Int() | None).first("1", default=()) is None
+
+    assert List(Int() | Str()).exists([[1, "2"], 3])
+    assert not List(Int() | Str()).exists([[1, "2"], None])
+    assert Dict(a=Int()).exists({"a": 1, "b": 2})
+    assert not Dict(a=Int()).exists({"b": 2})
+
+    assert Dict(a=Int()).matches({"a": 1})
+    assert not Dict(a=Int()).matches({"a": 1, "b": 2})
+    assert List(Int() | Str()).matches([1, "2", 3])
+    assert not List(Int() | Str()).matches([[1, "2"], 3])
+    assert not Int().matches([1])
+
+
+def test_exists_short_circuit() -> None:
+    pattern = List(List(Bool() | Bool()))
+    document: Document = [[True] * 64] * 64
+
+    assert pattern.exists(document)
+    assert pattern.first(document) == document
+
+
+def test_memoized_aliases() -> None:
+    calls = 0
+
+    def count(x: Document) -> Document:
+        nonlocal calls
+        calls += 1
+        return x
+
+    document = load_from_text(
+        r"{a: &A [1, 2, 3], b: *A, c: [*A, *A], d: [1, 2, 3]}",
+    )
+    items = List(Int() >> count)
+    pattern = Dict(a=items, b=items, c=List(items | None), d=items)
+
+    assert tuple(pattern.apply_memoized(document)) == (document,)
+    assert calls == 6
+
+    calls = 0
+    assert tuple(pattern.apply(document)) == (document,)
+    assert calls == 15
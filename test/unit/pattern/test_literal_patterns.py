@@ -0,0 +1,86 @@
+from functools import reduce
+from operator import or_
+
+from yamlang.pattern import DictPattern as Dict
+from yamlang.pattern import IntPattern as Int
+from yamlang.pattern import Pattern
+from yamlang.pattern import StrPattern as Str
+from yamlang.yamltools import Document
+
+SENTINEL_LITERAL_STR = "__SENTINEL_LITERAL_STR__"
+
+
+def match_success(
+    p: Pattern,
+    d: Document | tuple[Document, ...],
+    r: Document | tuple[Document, ...] = SENTINEL_LITERAL_STR,
+) -> bool:
+    document = list(d) if isinstance(d, tuple) else d
+    result = tuple(p.apply(document))
+    answer = (
+        r
+        if isinstance(r, tuple)
+        else (r,)
+        if r != SENTINEL_LITERAL_STR
+        else d
+        if isinstance(d, tuple)
+        else (d,)
+    )
+    if result != answer:
+        print("actual:", result)
+        print("expected:", answer)
+    return (
+        result == answer
+        and result == tuple(p.compile()(document))
+        and result == tuple(p.nth(document, i) for i in range(len(result)))
+    )
+
+
+def match_failure(p: Pattern, d: Document | tuple[Document, ...]) -> bool:
+    return match_success(p, d, ())
+
+
+def test_literal_alternation() -> None:
+    pattern = Str("a") | Str("b") | Str("c")
+
+    assert match_success(pattern, "a")
+    assert match_success(pattern, "c")
+    assert match_failure(pattern, "d")
+    assert match_failure(pattern, None)
+    assert match_success(
+        pattern,
+        ("c", "a", 1, "b", "a"),
+        ("a", "a", "b", "c"),
+    )
+    assert match_success(Str("a") | Str("b") | Str("a"), "a", ("a", "a"))
+    assert match_success(Int(1) | Int(2), 1)
+    assert match_failure(Int(1) | Int(2), True)
+    assert match_failure(Int(1) | Int(2), 1.0)
+    assert match_success(Int() | Str("a") | Str("b"), ("b", 1), (1, "b"))
+    assert match_success(
+        Str("a") | Int(1) | Str("b"),
+        ("b", 1, "a"),
+        ("a", 1, "b"),
+    )
+
+    assert Str.one_of(["a", "b", "c"]).deterministic
+    assert not (Str("a") | Str("a")).deterministic
+    assert repr(Str("a") | Str("b")) == repr(Str.one_of(["a", "b"]))
+
+
+def test_literal_allow_list() -> None:
+    values = [f"value-{i}" for i in range(5000)]
+    pattern = Dict(kind=Str.one_of(values))
+
+    assert match_success(pattern, {"kind": "value-4321"})
+    assert match_failure(pattern, {"kind": "value-5000"})
+    assert match_success(
+        pattern,
+        {"kind": ["value-2", "value-1", "other"]},
+        ({"kind": "value-1"}, {"kind": "value-2"}),
+    )
+    assert match_success(
+        reduce(or_, map(Str, values[:500])),
+        ("value-7", "value-3"),
+        ("value-3", "value-7"),
+    )
@@ -179,3 +179,21 @@ def test_custom_nested_dict_attribute_pattern() -> None:
 
     assert match_failure(Parent().child["b"], {"child": {"name": "A", "a": 1}})
     assert match_failure(Parent().child["b"], {"child": {"name": "B", "a": 1}})
+
+
+def test_custom_dict_attribute_cache() -> None:
+    class Parent(Dict):
+        class Child(Dict):
+            a = Int()
+
+        child = Child() | None
+
+    parent = Parent()
+    assert parent.child is parent.child
+    assert parent.child.a is parent.child.a
+    assert Parent().child is not parent.child
+    assert Parent.child is vars(Parent)["child"]
+
+    assert match_success(parent.child.a, {"child": {"a": 1}}, 1)
+    assert match_success(parent.child.a, {"child": {"a": 2}}, 2)
+    assert match_failure(parent.child.a, {"child": {"a": "1"}})
@@ -0,0 +1,56 @@
+from pickle import dumps
+from pickle import loads
+
+from yamlang.pattern import BoolPattern as Bool
+from yamlang.pattern import DictPattern as Dict
+from yamlang.pattern import IntPattern as Int
+from yamlang.pattern import ListPattern as List
+from yamlang.pattern import Pattern
+from yamlang.pattern import StrPattern as Str
+from yamlang.yamltools import Document
+from yamlang.yamltools import load_from_text
+
+
+class Parent(Dict):
+    class ChildA(Dict):
+        name = Str("A")
+        a = Int()
+
+    class ChildB(Dict):
+        name = Str("B")
+        a = Int()
+        b = Bool()
+
+    child = ChildA() | ChildB()
+    items = List(Int() | Str())
+
+
+def match_same(p: Pattern, d: Document) -> bool:
+    # Applying first fills the caches, which must not get in the way.
+    answer = tuple(p.apply(d))
+    result = tuple(loads(dumps(p)).apply(d))
+    if result != answer:
+        print("actual:", result)
+        print("expected:", answer)
+    return result == answer
+
+
+def test_pickled_pattern() -> None:
+    document = {
+        "child": [{"name": "A", "a": 1}, {"name": "B", "a": 2, "b": True}],
+        "items": [1, ["2", 3]],
+    }
+
+    assert match_same(Int(1), [1, 2, 1])
+    assert match_same(List(Int() | Str() | None)[0], [[1, "2"], None])
+    assert match_same(Dict(a=Int() >> str), {"a": 1})
+    assert match_same(Dict(a=Str() << str), {"a": 1})
+    assert match_same(Str() << load_from_text, "1")
+    assert match_same(Parent(), document)
+    assert match_same(Parent().child.a, document)
+    assert match_same(Parent().child["b"], document)
+    assert match_same(List(Parent().items, workers=2), [document])
+
+    assert loads(dumps(Parent.child)).name == "child"
+    assert loads(dumps(Parent.items)).name == "items"
+    assert repr(loads(dumps(Parent().child))) == repr(Parent.child)
@@ -0,0 +1,77 @@
+from yamlang.pattern import DictPattern as Dict
+from yamlang.pattern import FloatPattern as Float
+from yamlang.pattern import IntPattern as Int
+from yamlang.pattern import ListPattern as List
+from yamlang.pattern import Pattern
+from yamlang.yamltools import Document
+
+SENTINEL_LITERAL_STR = "__SENTINEL_LITERAL_STR__"
+
+
+def match_success(
+    p: Pattern,
+    d: Document | tuple[Document, ...],
+    r: Document | tuple[Document, ...] = SENTINEL_LITERAL_STR,
+) -> bool:
+    document = list(d) if isinstance(d, tuple) else d
+    result = tuple(p.apply(document))
+    answer = (
+        r
+        if isinstance(r, tuple)
+        else (r,)
+        if r != SENTINEL_LITERAL_STR
+        else d
+        if isinstance(d, tuple)
+        else (d,)
+    )
+    if result != answer:
+        print("actual:", result)
+        print("expected:", answer)
+    return (
+        result == answer
+        and result == tuple(p.compile()(document))
+        and result == tuple(p.nth(document, i) for i in range(len(result)))
+    )
+
+
+def match_failure(p: Pattern, d: Document | tuple[Document, ...]) -> bool:
+    return match_success(p, d, ())
+
+
+def test_range_pattern() -> None:
+    pattern = Int.in_range(0, 10)
+
+    assert match_success(pattern, 0)
+    assert match_success(pattern, 10)
+    assert match_failure(pattern, 11)
+    assert match_failure(pattern, -1)
+    assert match_failure(pattern, True)
+    assert match_failure(pattern, 1.0)
+    assert match_success(pattern, (-1, 3, 12, 7), (3, 7))
+    assert match_success(Int.min(5), 1000)
+    assert match_failure(Int.min(5), 4)
+    assert match_success(Int.max(5), -1000)
+    assert match_failure(Int.max(5), 6)
+    assert match_success(Float.in_range(0.0, 1.0), 0.5)
+    assert match_failure(Float.in_range(0.0, 1.0), float("nan"))
+    assert match_failure(Float.min(0), 1)
+    assert match_success(
+        Dict(port=Int.in_range(1, 65535), ratio=Float.max(1.0)),
+        {"port": 8080, "ratio": 0.25},
+    )
+    assert pattern.deterministic
+
+
+def test_range_list_pattern() -> None:
+    assert match_success(List(Int.in_range(0, 10)), [0, 5, 10])
+    assert match_failure(List(Int.in_range(0, 10)), [0, 5, 11])
+    assert match_failure(List(Int.in_range(0, 10)), [0, False])
+    assert match_success(List(Int.in_range(0, 10)), [[1, 11], 2], [1, 2])
+    assert match_success(List(Float.max(1.0)), [0.5, 1.0])
+    assert match_failure(List(Float.max(1.0)), [0.5, float("nan")])
+    assert match_failure(List(Float.max(1.0)), [float("nan"), 0.5])
+    assert match_success(List(Float.min(0.0)), [])
+
+    document = list(range(100000))
+    assert match_success(List(Int.in_range(0, 99999)), document)
+    assert match_failure(List(Int.in_range(1, 99999)), document)
@@ -0,0 +1,76 @@
+from re import IGNORECASE
+
+from yamlang.pattern import DictPattern as Dict
+from yamlang.pattern import ListPattern as List
+from yamlang.pattern import Pattern
+from yamlang.pattern import StrPattern as Str
+from yamlang.yamltools import Document
+
+SENTINEL_LITERAL_STR = "__SENTINEL_LITERAL_STR__"
+
+
+def match_success(
+    p: Pattern,
+    d: Document | tuple[Document, ...],
+    r: Document | tuple[Document, ...] = SENTINEL_LITERAL_STR,
+) -> bool:
+    document = list(d) if isinstance(d, tuple) else d
+    result = tuple(p.apply(document))
+    answer = (
+        r
+        if isinstance(r, tuple)
+        else (r,)
+        if r != SENTINEL_LITERAL_STR
+        else d
+        if isinstance(d, tuple)
+        else (d,)
+    )
+    if result != answer:
+        print("actual:", result)
+        print("expected:", answer)
+    return (
+        result == answer
+        and result == tuple(p.compile()(document))
+        and result == tuple(p.nth(document, i) for i in range(len(result)))
+    )
+
+
+def match_failure(p: Pattern, d: Document | tuple[Document, ...]) -> bool:
+    return match_success(p, d, ())
+
+
+def test_regex_pattern() -> None:
+    pattern = Str.regex(r"[a-z]+-[0-9]+")
+
+    assert match_success(pattern, "abc-12")
+    assert match_failure(pattern, "abc-12x")
+    assert match_failure(pattern, "ABC-12")
+    assert match_failure(pattern, 12)
+    assert match_success(Str.regex("[a-z]+", IGNORECASE), "ABC")
+    assert match_success(pattern, ("a-1", "b", "c-2"), ("a-1", "c-2"))
+    assert match_success(
+        Dict(id=pattern, tags=List(Str.regex(r"\w+"))),
+        {"id": "x-1", "tags": ["a", "b_2"]},
+    )
+    assert pattern.deterministic
+
+
+def test_affix_pattern() -> None:
+    prefix = Str.prefix("ab", "b", "abcd")
+    suffix = Str.suffix(".yaml", ".yml")
+
+    assert match_success(prefix, "ab")
+    assert match_success(prefix, "abc")
+    assert match_success(prefix, "bcd")
+    assert match_failure(prefix, "a")
+    assert match_failure(prefix, "cab")
+    assert match_success(Str.prefix(""), "")
+    assert match_failure(Str.prefix(), "")
+    assert match_success(suffix, "a.yaml")
+    assert match_success(suffix, ".yml")
+    assert match_failure(suffix, "a.yaml.bak")
+    assert match_success(suffix, ("a.yml", "b.json"), "a.yml")
+
+    prefixes = [f"{i:05}" for i in range(0, 100000, 7)]
+    assert match_success(Str.prefix(*prefixes), "00007-item")
+    assert match_failure(Str.prefix(*prefixes), "00008-item")
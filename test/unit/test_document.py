@@ -1,8 +1,30 @@
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from threading import Barrier
+from threading import Event
+
+import pytest
+import yaml
+
+from yamlang.pattern import DictPattern
+from yamlang.pattern import IntPattern
 from yamlang.yamltools import Document
+from yamlang.yamltools import DocumentCache
 from yamlang.yamltools import FoldMap
 from yamlang.yamltools import Map
+from yamlang.yamltools import YamLangLoader
+from yamlang.yamltools import dump
+from yamlang.yamltools import dump_stream
+from yamlang.yamltools import load_events
+from yamlang.yamltools import load_file_stream
+from yamlang.yamltools import load_files
+from yamlang.yamltools import load_from_file
 from yamlang.yamltools import load_from_text
+from yamlang.yamltools import load_stream
 from yamlang.yamltools import patch_yaml_loader
+from yamlang.yamltools import use_libyaml
+from yamlang.yamltools.document import document as document_module
 
 
 def test_load_yaml() -> None:
@@ -38,6 +60,260 @@ def test_load_yaml() -> None:
     }
 
 
+def test_load_yaml_without_patching() -> None:
+    text = "[on, null, 2023-01-01, {? yes}]"
+
+    assert yaml.load(text, Loader=YamLangLoader) == [
+        "on",
+        "null",
+        "2023-01-01",
+        {"yes": None},
+    ]
+    assert load_from_text(text) == yaml.load(text, Loader=YamLangLoader)
+    assert load_from_text(
+        "[!!bool yes, !!null Null, !!null ~, 2023-01-01]",
+    ) == [
+        "yes",
+        "Null",
+        None,
+        "2023-01-01",
+    ]
+    if yaml.__with_libyaml__:
+        assert yaml.load(text, Loader=yaml.CFullLoader)[:2] == [True, None]
+
+
+def test_load_yaml_backends() -> None:
+    text = (
+        "{a: &A {x: null, y: [yes, 2023-01-01]}, b: *A, c: {<<: *A, z: 1.5},"
+        " d: [~, true, off, '012', 0x1F], e: 'multi\\nline'}"
+    )
+    try:
+        use_libyaml(False)
+        document = load_from_text(text)
+        projected = load_from_text(text, {"c": {"y": None}})
+        dumped = dump(document)
+        assert list(load_events(text)) == [document]
+        assert list(load_events(text, {"c": {"y": None}})) == [projected]
+        use_libyaml(True)
+        assert load_from_text(text) == document
+        assert load_from_text(text, {"c": {"y": None}}) == projected
+        assert dump(document) == dumped
+        assert list(load_events(text)) == [document]
+        assert list(load_events(text, {"c": {"y": None}})) == [projected]
+    finally:
+        use_libyaml()
+
+
+def test_load_yaml_stream(tmp_path: Path) -> None:
+    text = "foo: 1\n---\n[bar, null]\n---\n---\nbaz\n"
+    documents = [{"foo": 1}, ["bar", "null"], None, "baz"]
+
+    stream = load_stream(text)
+    assert next(stream) == {"foo": 1}
+    assert list(stream) == documents[1:]
+
+    path = tmp_path / "stream.yaml"
+    path.write_text(text)
+    assert list(load_file_stream(path)) == documents
+    assert list(load_file_stream(tmp_path / "missing.yaml")) == []
+
+    with path.open() as file:
+        assert list(load_stream(file)) == documents
+
+
+def test_dump_yaml_stream(tmp_path: Path) -> None:
+    documents: list[Document] = [
+        {"foo": [1, "on", 2.5], "bar": {"baz": "2023-01-01"}},
+        "qux",
+        [],
+        {},
+    ]
+    path = tmp_path / "stream.yaml"
+
+    try:
+        for libyaml in (False, True):
+            use_libyaml(libyaml)
+            with path.open("w") as file:
+                count = dump_stream(iter(documents), file)
+
+            assert count == 4
+            assert list(load_file_stream(path)) == documents
+            assert path.read_text().startswith(f"---\n{dump(documents[0])}")
+    finally:
+        use_libyaml()
+
+
+def test_load_yaml_events() -> None:
+    text = (
+        "{a: &A {x: 1, y: [2, 3]}, b: *A, c: {<<: *A, y: 4}, d: [{x: 5}]}\n"
+        "---\n"
+        "[{x: yes, y: 2023-01-01}, {x: null, z: {w: 6}}, 7]\n"
+    )
+    assert list(load_events(text)) == list(load_stream(text))
+
+    assert list(load_events(text, {"c": {"y": None}, "d": {}})) == [
+        {"c": {"y": 4}, "d": [{}]},
+        [{}, {}, 7],
+    ]
+    assert list(load_events(text, {"b": {}, "x": None})) == [
+        {"b": {"x": 1, "y": [2, 3]}},
+        [{"x": "yes"}, {"x": "null"}, 7],
+    ]
+
+
+def test_load_yaml_projection(tmp_path: Path) -> None:
+    text = (
+        "{a: &A {x: 1, y: [2, 3]}, b: *A, c: {<<: *A, y: 4}, "
+        "d: [{x: 5, z: 6}], on: {x: yes}, null: 7}"
+    )
+    assert load_from_text(text, None) == load_from_text(text)
+    assert load_from_text(text, {"c": {"y": None}, "d": {}}) == {
+        "c": {"y": 4},
+        "d": [{}],
+    }
+    assert load_from_text(text, {"b": {}, "on": None, "null": None}) == {
+        "b": {},
+        "on": {"x": "yes"},
+        "null": 7,
+    }
+
+    path = tmp_path / "document.yaml"
+    path.write_text(text)
+    assert load_from_file(path, {"d": {"z": None}}) == {"d": [{"z": 6}]}
+    assert load_from_file(tmp_path / "missing.yaml", {}) is None
+
+    class My(DictPattern):
+        c = DictPattern(y=IntPattern())
+
+    assert load_from_text(text, My()) == {"c": {"y": 4}}
+    assert load_from_file(path, My()) == {"c": {"y": 4}}
+    assert list(load_events(text, My())) == [{"c": {"y": 4}}]
+    with pytest.raises(TypeError):
+        load_from_text(text, ["c"])  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_load_yaml_files(tmp_path: Path, executor: str) -> None:
+    paths: list[Document] = []
+    for i in range(20):
+        path = tmp_path / f"{i}.yaml"
+        path.write_text(f"{{id: {i}, on: [yes, {i * 2}]}}")
+        paths.append(str(path))
+    paths.insert(7, str(tmp_path / "missing.yaml"))
+    documents = load_from_file(paths)
+
+    assert documents[7] is None
+    assert documents[8] == {"id": 7, "on": ["yes", 14]}
+    assert load_from_file(paths, workers=3, executor=executor) == documents
+    assert load_from_file(
+        paths,
+        {"id": None},
+        workers=3,
+        executor=executor,
+    ) == [document and {"id": document["id"]} for document in documents]
+
+    nested = [paths[:2], [], paths[8]]
+    assert load_from_file(nested, workers=2, executor=executor) == (
+        load_from_file(nested)
+    )
+
+    files = load_files(iter(paths), workers=4, executor=executor)
+    assert list(files) == list(zip(paths, documents))
+    files = load_files(paths, workers=4, executor=executor, ordered=False)
+    assert sorted(files, key=lambda file: paths.index(file[0])) == list(
+        zip(paths, documents),
+    )
+
+
+def test_load_yaml_files_backend(tmp_path: Path) -> None:
+    path = tmp_path / "document.yaml"
+    path.write_text("{id: 0}")
+    queued = Event()
+    switched = Barrier(2)
+
+    class Switch:
+        # Both workers switch the backend once the last load is queued.
+        def __str__(self) -> str:
+            queued.wait()
+            use_libyaml(False)
+            switched.wait()
+            return str(path)
+
+    def paths() -> Iterator[Document]:
+        yield Switch()  # type: ignore[misc]
+        yield Switch()  # type: ignore[misc]
+        yield str(path)
+        queued.set()
+
+    try:
+        files = load_files(paths(), workers=2)
+        assert [document for _, document in files] == [{"id": 0}] * 3
+        assert not document_module._libyaml
+    finally:
+        use_libyaml()
+
+
+def test_load_yaml_cache(tmp_path: Path) -> None:
+    paths: list[Document] = []
+    for i in range(10):
+        path = tmp_path / f"{i}.yaml"
+        path.write_text(f"{{id: {i}, on: [yes, {i * 2}]}}")
+        paths.append(str(path))
+    documents = load_from_file(paths)
+
+    cache = DocumentCache(tmp_path / "cache")
+    assert load_from_file(paths, cache=cache) == documents
+    assert len(list((tmp_path / "cache").iterdir())) == 10
+    assert load_from_file(paths, {"on": None}, cache=cache) == [
+        {"on": document["on"]} for document in documents  # type: ignore
+    ]
+
+    # Warm loads read neither the files nor the YAML in them.
+    path = tmp_path / "0.yaml"
+    stat = path.stat()
+    path.write_text("{id: 9, on: [no!, 0]}")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert load_from_file(path, cache=cache) == documents[0]
+    assert load_from_file(path, cache=DocumentCache(cache.directory)) == (
+        documents[0]
+    )
+    files = load_files(paths, workers=2, executor="process", cache=cache)
+    assert [document for _, document in files] == documents
+
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert load_from_file(path, cache=cache) == {"id": 9, "on": ["no!", 0]}
+
+    cached = load_from_file(path, cache=cache)
+    cached["id"] = 0  # type: ignore
+    assert load_from_file(path, cache=cache) == {"id": 9, "on": ["no!", 0]}
+
+    cache = DocumentCache(tmp_path / "small", max_bytes=100, memory_bytes=0)
+    assert load_from_file(paths[1:], cache=cache) == documents[1:]
+    assert load_from_file(paths[1:], cache=cache) == documents[1:]
+    assert 0 < len(list(cache.directory.iterdir())) < 9
+
+    cache.clear()
+    assert not list(cache.directory.iterdir())
+
+    # Corrupt entries are loaded again and replaced.
+    cache = DocumentCache(tmp_path / "corrupt", memory_bytes=0)
+    assert load_from_file(paths[1], cache=cache) == documents[1]
+    for entry in cache.directory.iterdir():
+        entry.write_bytes(b"\xff corrupt")
+    assert load_from_file(paths[1], cache=cache) == documents[1]
+    assert load_from_file(paths[1], cache=cache) == documents[1]
+
+
+def test_load_yaml_unwritable_cache(tmp_path: Path) -> None:
+    path = tmp_path / "0.yaml"
+    path.write_text("{id: 0, on: [yes, 0]}")
+
+    # The directory cannot be created below a file.
+    cache = DocumentCache(path / "cache", memory_bytes=0)
+    assert load_from_file(path, cache=cache) == {"id": 0, "on": ["yes", 0]}
+    assert load_from_file(path, cache=cache) == {"id": 0, "on": ["yes", 0]}
+
+
 def test_map_increment() -> None:
     def increment(x: int) -> int:
         return x + 1
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from itertools import count
+from itertools import product
+from typing import TYPE_CHECKING
+from typing import Any
+
+from yamlang.yamltools import Document
+
+if TYPE_CHECKING:
+    from yamlang.pattern.pattern import Pattern
+
+Matcher = Callable[[Document], Iterator[Document]]
+Continuation = Callable[[str], None]
+
+# CPython rejects more than 20 statically nested loops in one function.
+_MAX_LOOP_DEPTH = 16
+
+
+class Compiler:
+    def __init__(self) -> None:
+        self.namespace: dict[str, Any] = {"product": product}
+        self._names = count()
+        self._lines: list[str] = []
+        self._indent = 1
+        self._loops = 0
+
+    def compile(self, pattern: Pattern) -> Matcher:
+        name = self.variable("match")
+        self._lines = [f"def {name}(document):"]
+        self.emit(
+            pattern,
+            "document",
+            lambda value: self.line(f"yield {value}"),
+        )
+        self.line("yield from ()")
+
+        source = "\n".join(self._lines)
+        exec(compile(source, f"<pattern {name}>", "exec"), self.namespace)
+        return self.namespace[name]
+
+    def emit(self, pattern: Pattern, source: str, then: Continuation) -> None:
+        if self._loops >= _MAX_LOOP_DEPTH:
+            # Continue in a separate function to keep the nesting shallow.
+            nested = Compiler()
+            nested.namespace = self.namespace
+            nested._names = self._names
+            matcher = self.constant(nested.compile(pattern))
+            result = self.variable("result")
+            with self.loop(f"for {result} in {matcher}({source}):"):
+                then(result)
+            return
+
+        pattern._emit(self, source, then)
+
+    def collect(self, pattern: Pattern, source: str) -> str:
+        results = self.variable("results")
+        self.line(f"{results} = []")
+        self.emit(
+            pattern,
+            source,
+            lambda result: self.line(f"{results}.append({result})"),
+        )
+        return results
+
+    def variable(self, prefix: str) -> str:
+        return f"{prefix}_{next(self._names)}"
+
+    def constant(self, value: Any) -> str:
+        name = self.variable("constant")
+        self.namespace[name] = value
+        return name
+
+    def assign(self, expression: str) -> str:
+        name = self.variable("value")
+        self.line(f"{name} = {expression}")
+        return name
+
+    def line(self, text: str) -> None:
+        self._lines.append("    " * self._indent + text)
+
+    @contextmanager
+    def block(self, header: str) -> Iterator[None]:
+        self.line(header)
+        self._indent += 1
+        try:
+            yield
+        finally:
+            self._indent -= 1
+
+    @contextmanager
+    def loop(self, header: str) -> Iterator[None]:
+        self._loops += 1
+        try:
+            with self.block(header):
+                yield
+        finally:
+            self._loops -= 1
+
+    @contextmanager
+    def lifted(self, source: str) -> Iterator[str]:
+        item = self.variable("item")
+        with self.loop(
+            f"for {item} in"
+            f" ({source} if isinstance({source}, list) else ({source},)):",
+        ):
+            yield item
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from collections.abc import Iterable
-from itertools import product
 from typing import Generic
 from typing import Self
 from typing import final
@@ -9,22 +8,41 @@ from typing import overload
 
 from typing_extensions import TypeVar
 
+from yamlang.pattern.compiler import Compiler
+from yamlang.pattern.compiler import Continuation
+from yamlang.pattern.dispatch import Discriminants
+from yamlang.pattern.pattern import NOTHING
+from yamlang.pattern.pattern import AmbiguousMatch
 from yamlang.pattern.pattern import Pattern
+from yamlang.pattern.pattern import Single
+from yamlang.pattern.product import cartesian_product
 from yamlang.yamltools import Document
+from yamlang.yamltools import Projection
 
 _T = TypeVar("_T", bound=Pattern, default=Pattern, infer_variance=True)
 
 
 @final
 class ListPattern(Pattern, Generic[_T]):
-    def __init__(self, pattern: _T) -> None:
+    def __init__(
+        self,
+        pattern: _T,
+        *,
+        workers: int = 1,
+        threshold: int = 10000,
+    ) -> None:
         self.__pattern = pattern
+        self.__workers = workers
+        self.__threshold = threshold
 
+    @Pattern.memoize
     def apply(self, document: Document) -> Iterable[list[Document]]:
         if isinstance(document, list):
-            for items in product(
-                *(self.__pattern.apply(item) for item in document)
-            ):
+            if self.__pattern._accepts_each(document):
+                yield document.copy()
+                return
+
+            for items in cartesian_product(*self.__choices(document)):
                 yield list(items)
 
     @overload
@@ -39,7 +57,117 @@ class ListPattern(Pattern, Generic[_T]):
         return super().__getitem__(__key)
 
     def __copy__(self) -> Self:
-        return ListPattern(self.__pattern)
+        return ListPattern(
+            self.__pattern,
+            workers=self.__workers,
+            threshold=self.__threshold,
+        )
+
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        if self.__workers > 1:
+            super()._emit(compiler, source, then)
+            return
+
+        with compiler.block(f"if isinstance({source}, list):"):
+            choices = compiler.variable("choices")
+            compiler.line(f"{choices} = []")
+
+            item = compiler.variable("item")
+            with compiler.loop(f"for {item} in {source}:"):
+                results = compiler.collect(self.__pattern, item)
+                with compiler.block(f"if not {results}:"):
+                    compiler.line("break")
+                compiler.line(f"{choices}.append({results})")
+
+            with compiler.block("else:"):
+                items = compiler.variable("items")
+                with compiler.loop(f"for {items} in product(*{choices}):"):
+                    then(compiler.assign(f"list({items})"))
+
+    def _make_single(self) -> Single | None:
+        if (single := self.__pattern._single()) is None:
+            return None
+
+        def list_single(document: Document) -> Document:
+            if not isinstance(document, list):
+                return NOTHING
+
+            if self.__pattern._accepts_each(document):
+                return document.copy()
+
+            # Lists matched in parallel take the generator path right away,
+            # so that a pool never matches them twice.
+            if self.__parallel(document):
+                raise AmbiguousMatch
+
+            items: list[Document] = []
+            for item in document:
+                if (result := single(item)) is NOTHING:
+                    return NOTHING
+                items.append(result)
+
+            return items
+
+        return list_single
+
+    def _count(self, document: Document) -> int:
+        if not isinstance(document, list):
+            return 0
+
+        total = 1
+        for item in document:
+            total *= self.__pattern.count(item)
+            if not total:
+                break
+
+        return total
+
+    def _nth(self, document: Document, index: int) -> list[Document]:
+        assert isinstance(document, list)
+
+        # The last item varies fastest, as in `itertools.product`.
+        items: list[Document] = []
+        for item in reversed(document):
+            index, remainder = divmod(index, self.__pattern.count(item))
+            items.append(self.__pattern._nth(item, remainder))
+
+        return items[::-1]
+
+    def _selects(self, document: Document, key: int | str) -> bool:
+        return (
+            isinstance(key, int)
+            and isinstance(document, list)
+            and -len(document) <= key < len(document)
+        )
+
+    def _projection(self) -> Projection:
+        return self.__pattern._projection()
+
+    def _rejects_none(self) -> bool:
+        return True
+
+    def __parallel(self, document: list[Document]) -> bool:
+        return self.__workers > 1 and len(document) >= self.__threshold
+
+    def __choices(self, document: list[Document]) -> list[Iterable[Document]]:
+        if not self.__parallel(document):
+            return [self.__pattern.apply(item) for item in document]
+
+        # Hand each worker a few chunks so that uneven items even out.
+        chunksize = -(-len(document) // (4 * self.__workers))
+        return [
+            results
+            for _, results in self.__pattern.apply_many(
+                document,
+                workers=self.__workers,
+                chunksize=chunksize,
+            )
+        ]
 
     def __repr__(self) -> str:
         subrepr = repr(self.__pattern).split("\n")
@@ -66,12 +194,13 @@ class DictPattern(Pattern, Generic[_T]):
         }
 
     @final
+    @Pattern.memoize
     @Pattern.lift
     def apply(self, document: Document) -> Iterable[dict[str, Document]]:
         if not isinstance(document, dict):
             return
 
-        for values in product(
+        for values in cartesian_product(
             *(p.apply(document.get(key)) for key, p in self.__patterns.items())
         ):
             yield dict(zip(self.__patterns.keys(), values))
@@ -92,6 +221,129 @@ class DictPattern(Pattern, Generic[_T]):
     def __copy__(self) -> Self:
         return type(self)(**self.__patterns)
 
+    @final
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        with compiler.lifted(source) as item:
+            with compiler.block(f"if isinstance({item}, dict):"):
+                # A one-shot loop so that a key without results can break.
+                with compiler.loop("while True:"):
+                    choices: list[str] = []
+                    for key, pattern in self.__patterns.items():
+                        value = compiler.assign(f"{item}.get({key!r})")
+                        results = compiler.collect(pattern, value)
+                        with compiler.block(f"if not {results}:"):
+                            compiler.line("break")
+                        choices.append(results)
+
+                    values = [compiler.variable("value") for _ in choices]
+                    entries = ", ".join(
+                        f"{key!r}: {value}"
+                        for key, value in zip(self.__patterns, values)
+                    )
+                    if values:
+                        with compiler.loop(
+                            f"for {', '.join(values)},"
+                            f" in product({', '.join(choices)}):",
+                        ):
+                            then(compiler.assign(f"{{{entries}}}"))
+                    else:
+                        then(compiler.assign("{}"))
+                    compiler.line("break")
+
+    @final
+    def _make_single(self) -> Single | None:
+        singles: list[tuple[str, Single]] = []
+        for key, pattern in self.__patterns.items():
+            if (single := pattern._single()) is None:
+                return None
+            singles.append((key, single))
+
+        def dict_single(document: Document) -> Document:
+            if not isinstance(document, dict):
+                return NOTHING
+
+            values: dict[str, Document] = {}
+            for key, single in singles:
+                if (value := single(document.get(key))) is NOTHING:
+                    return NOTHING
+                values[key] = value
+
+            return values
+
+        return Pattern.lift_single(dict_single)
+
+    @final
+    def _count(self, document: Document) -> int:
+        if isinstance(document, list):
+            return sum(self.__count(item) for item in document)
+
+        return self.__count(document)
+
+    @final
+    def _nth(self, document: Document, index: int) -> dict[str, Document]:
+        for item in document if isinstance(document, list) else (document,):
+            if index < (count := self.__count(item)):
+                return self.__nth(item, index)
+            index -= count
+
+        raise IndexError("pattern result index out of range")
+
+    @final
+    def _selects(self, document: Document, key: int | str) -> bool:
+        return isinstance(key, str) and key in self.__patterns
+
+    @final
+    def _projection(self) -> Projection:
+        return {key: p._projection() for key, p in self.__patterns.items()}
+
+    @final
+    def _rejects_none(self) -> bool:
+        return True
+
+    @final
+    def _discriminants(self) -> Discriminants:
+        required: set[str] = set()
+        literals: dict[str, frozenset[Document]] = {}
+        for key, pattern in self.__patterns.items():
+            if pattern._rejects_none():
+                required.add(key)
+            if (values := pattern._literals()) is not None:
+                literals[key] = values
+
+        return frozenset(required), literals
+
+    @final
+    def __count(self, document: Document) -> int:
+        if not isinstance(document, dict):
+            return 0
+
+        total = 1
+        for key, pattern in self.__patterns.items():
+            total *= pattern.count(document.get(key))
+            if not total:
+                break
+
+        return total
+
+    @final
+    def __nth(
+        self,
+        document: dict[str, Document],
+        index: int,
+    ) -> dict[str, Document]:
+        # The last key varies fastest, as in `itertools.product`.
+        values: dict[str, Document] = {}
+        for key, pattern in reversed(self.__patterns.items()):
+            index, remainder = divmod(index, pattern.count(document.get(key)))
+            values[key] = pattern._nth(document.get(key), remainder)
+
+        return {key: values[key] for key in self.__patterns}
+
     @final
     def __repr__(self) -> str:
         subreprs: list[str] = []
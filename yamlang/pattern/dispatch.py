@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterator
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from yamlang.yamltools import Document
+
+if TYPE_CHECKING:
+    from yamlang.pattern.pattern import Pattern
+
+# The keys that every dict accepted by a pattern has, and the values that
+# some of them are limited to; see `Pattern._discriminants`.
+Discriminants = tuple[frozenset[str], dict[str, frozenset[Document]]]
+
+# Shorter alternations are cheaper to try one after another.
+MIN_BRANCHES = 3
+
+
+class DispatchTable:
+    # Picks the branches of an alternation of dict patterns that can match a
+    # dict. It only filters: the branches are still applied in their order.
+    def __init__(
+        self,
+        branches: Sequence[Pattern],
+        discriminants: Sequence[Discriminants],
+    ) -> None:
+        self._branches = branches
+        self._required = [required for required, _ in discriminants]
+        self._indices = range(len(branches))
+
+        # The key with literal values in the most branches is the tag.
+        tags = Counter(key for _, values in discriminants for key in values)
+        self._tag: str | None = None
+        self._untagged: list[int] = []
+        self._tagged: dict[Document, list[int]] = {}
+        if not tags:
+            return
+
+        self._tag = tag = tags.most_common(1)[0][0]
+        self._untagged = [
+            index
+            for index, (_, values) in enumerate(discriminants)
+            if tag not in values
+        ]
+        for index, (_, values) in enumerate(discriminants):
+            for value in values.get(tag, ()):
+                self._tagged.setdefault(value, []).append(index)
+
+        for value, indices in self._tagged.items():
+            self._tagged[value] = sorted({*indices, *self._untagged})
+
+    @classmethod
+    def build(cls, branches: Sequence[Pattern]) -> DispatchTable | None:
+        if len(branches) < MIN_BRANCHES:
+            return None
+
+        discriminants: list[Discriminants] = []
+        for branch in branches:
+            if (discriminant := branch._discriminants()) is None:
+                return None
+            discriminants.append(discriminant)
+
+        return cls(branches, discriminants)
+
+    def candidates(self, document: dict[str, Document]) -> Iterator[Pattern]:
+        indices: Sequence[int] = self._indices
+        if self._tag is not None:
+            value = document.get(self._tag)
+            # Scalar patterns also match the items of a list.
+            if not isinstance(value, list):
+                try:
+                    indices = self._tagged.get(value, self._untagged)
+                except TypeError:
+                    indices = self._untagged
+
+        keys = document.keys()
+        for index in indices:
+            if keys >= self._required[index]:
+                yield self._branches[index]
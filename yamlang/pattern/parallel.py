@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from yamlang.yamltools import Document
+
+if TYPE_CHECKING:
+    from yamlang.pattern.pattern import Pattern
+
+# The results of one document, paired with its position in the batch.
+Match = tuple[int, tuple[Document, ...]]
+
+# The pattern of the batch, shipped once to every worker process.
+_pattern: Pattern | None = None
+
+
+def apply_many(
+    pattern: Pattern,
+    documents: Iterable[Document],
+    workers: int,
+    chunksize: int,
+    ordered: bool,
+) -> Iterator[Match]:
+    if chunksize < 1:
+        raise ValueError("chunksize must be positive")
+
+    # Worker processes cannot start pools of their own, so nested batches,
+    # e.g. of a parallel `ListPattern` inside the pattern, run in place.
+    if workers <= 1 or _pattern is not None:
+        for index, document in enumerate(documents):
+            yield index, tuple(pattern.apply(document))
+        return
+
+    chunks = _chunks(documents, chunksize)
+    executor = ProcessPoolExecutor(
+        workers,
+        initializer=_initialize,
+        initargs=(pattern,),
+    )
+    try:
+        # Keep a couple of chunks per worker in flight, so that a long or
+        # lazy batch is neither read nor answered all at once.
+        pending: deque[Future[list[Match]]] = deque()
+        for start, chunk in islice(chunks, 2 * workers):
+            pending.append(executor.submit(_match_chunk, start, chunk))
+
+        while pending:
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                done = [future for future in pending if future in finished]
+                for future in done:
+                    pending.remove(future)
+
+            for future in done:
+                yield from future.result()
+                for start, chunk in islice(chunks, 1):
+                    pending.append(executor.submit(_match_chunk, start, chunk))
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _chunks(
+    documents: Iterable[Document],
+    chunksize: int,
+) -> Iterator[tuple[int, list[Document]]]:
+    iterator = iter(documents)
+    start = 0
+    while chunk := list(islice(iterator, chunksize)):
+        yield start, chunk
+        start += len(chunk)
+
+
+def _initialize(pattern: Pattern) -> None:
+    global _pattern
+    _pattern = pattern
+
+
+def _match_chunk(start: int, documents: list[Document]) -> list[Match]:
+    assert _pattern is not None
+    return [
+        (index, tuple(_pattern.apply(document)))
+        for index, document in enumerate(documents, start)
+    ]
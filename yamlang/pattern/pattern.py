@@ -4,54 +4,222 @@ from abc import ABC
 from abc import abstractmethod
 from collections.abc import Callable
 from collections.abc import Iterable
-from copy import copy
+from collections.abc import Iterator
+from contextvars import ContextVar
+from copyreg import __newobj__
 from functools import wraps
-from types import MethodType
+from itertools import islice
+from random import Random
+from sys import maxsize
+from typing import IO
+from typing import TYPE_CHECKING
+from typing import Any
 from typing import Self
 from typing import final
 from typing import overload
 
 from typing_extensions import TypeVar
 
+from yamlang.pattern.compiler import Compiler
+from yamlang.pattern.compiler import Continuation
+from yamlang.pattern.compiler import Matcher
+from yamlang.pattern.dispatch import Discriminants
+from yamlang.pattern.dispatch import DispatchTable
+from yamlang.pattern.parallel import Match
+from yamlang.pattern.parallel import apply_many
+from yamlang.pattern.product import lazy_mode
 from yamlang.yamltools import Document
+from yamlang.yamltools import Projection
+from yamlang.yamltools import load_events
+from yamlang.yamltools.document.projection import merge
 
 _T1 = TypeVar("_T1", bound="Pattern", default="Pattern", infer_variance=True)
 _T2 = TypeVar("_T2", bound=Document, default=Document, infer_variance=True)
+_T3 = TypeVar("_T3", infer_variance=True)
+
+_RANDOM = Random()
+
+# Returned by single-result functions when there is no result.
+NOTHING: Any = object()
+
+# A function that computes the only result of a pattern, or NOTHING.
+Single = Callable[[Document], Document]
+
+
+class AmbiguousMatch(Exception):
+    # Raised by a single-result function once the document turns out to
+    # produce several results after all, e.g. through `Pattern.lift`, or
+    # once the generator path is known to be cheaper for it.
+    pass
+
+
+# Results per (pattern, id(document)) within `Pattern.apply_memoized`; the
+# document is kept alongside so that its id cannot be reused meanwhile.
+memo_table: ContextVar[
+    dict[tuple[Pattern, int], tuple[Document, tuple[Document, ...]]] | None
+] = ContextVar("memo_table", default=None)
 
 
 class Pattern(ABC):
+    __slots__ = ("name", "_fields", "_single_function")
+
+    # Slots that cache derived objects, which are not part of the pickle.
+    _CACHES = frozenset(("_fields", "_single_function"))
+
+    if TYPE_CHECKING:
+        name: str
+        _fields: dict[Pattern, Pattern]
+        _single_function: Single | None
+
     @abstractmethod
     def apply(self, document: Document) -> Iterable[Document]:
         raise NotImplementedError
 
-    def __getitem__(self, __key: int | str) -> Pattern:
-        if isinstance(__key, int):
+    @final
+    def apply_lazy(self, document: Document) -> Iterator[Document]:
+        return _resumed(lambda: self.apply(document), lazy_mode, True)
+
+    @final
+    def apply_memoized(self, document: Document) -> Iterator[Document]:
+        return _resumed(lambda: self.apply(document), memo_table, {})
+
+    @final
+    def apply_many(
+        self,
+        documents: Iterable[Document],
+        *,
+        workers: int = 1,
+        chunksize: int = 256,
+        ordered: bool = True,
+    ) -> Iterator[Match]:
+        # Yields `(index, results)` per document, in input order or, if not
+        # `ordered`, as soon as the chunk of the document is done.
+        return apply_many(self, documents, workers, chunksize, ordered)
+
+    @final
+    def apply_stream(
+        self,
+        documents: Iterable[Document],
+    ) -> Iterator[Document]:
+        # Results of each document in turn; with a lazy iterable such as
+        # `load_stream`, a document can be freed once it has been matched.
+        for document in documents:
+            yield from self.apply(document)
+
+    @final
+    def apply_events(self, stream: str | IO[str]) -> Iterator[Document]:
+        # Matches the documents of a YAML stream, built from parser events
+        # only as far as the pattern reads them.
+        return self.apply_stream(load_events(stream, self.projection))
+
+    @overload
+    def first(self, document: Document) -> Document:
+        ...
+
+    @overload
+    def first(self, document: Document, *, default: _T3) -> Document | _T3:
+        ...
 
-            def new_apply(_, document: Document) -> Iterable[Document]:
-                for result in self.apply(document):
-                    if isinstance(result, list):
-                        if -len(result) <= __key < len(result):
-                            yield result[__key]
+    @final
+    def first(
+        self,
+        document: Document,
+        *,
+        default: _T3 | None = None,
+    ) -> Document | _T3:
+        for result in self.apply_lazy(document):
+            return result
+
+        return default
+
+    @final
+    def exists(self, document: Document) -> bool:
+        for _ in self.apply_lazy(document):
+            return True
+
+        return False
 
-        elif isinstance(__key, str):
+    @final
+    def matches(self, document: Document) -> bool:
+        # Whether the pattern accepts the document as it is, i.e. without
+        # dropping keys or picking items out of it.
+        for result in self.apply_lazy(document):
+            if result == document:
+                return True
 
-            def new_apply(_, document: Document) -> Iterable[Document]:
-                for result in self.apply(document):
-                    if isinstance(result, dict):
-                        if __key in result:
-                            yield result[__key]
+        return False
 
+    @final
+    def count(self, document: Document) -> int:
+        return self._count(document)
+
+    @final
+    def nth(self, document: Document, index: int) -> Document:
+        total = self.count(document)
+        if index < 0:
+            index += total
+
+        if not 0 <= index < total:
+            raise IndexError("pattern result index out of range")
+
+        return self._nth(document, index)
+
+    @final
+    def sample(
+        self,
+        document: Document,
+        k: int,
+        *,
+        random: Random | None = None,
+    ) -> list[Document]:
+        random = random or _RANDOM
+        population = self.count(document)
+
+        if population <= maxsize:
+            indices = random.sample(range(population), k)
+        elif k < 0:
+            raise ValueError("sample larger than population or is negative")
         else:
+            # `range` cannot be sampled beyond `sys.maxsize`; with far more
+            # results than requested, rejecting repeated picks is cheap.
+            chosen: dict[int, None] = {}
+            while len(chosen) < k:
+                chosen[random.randrange(population)] = None
+            indices = list(chosen)
 
-            def new_apply(_, document: Document) -> Iterable[Document]:
-                yield from ()
+        return [self._nth(document, index) for index in indices]
 
-        return self._updated(new_apply)
+    def __getitem__(self, __key: int | str) -> Pattern:
+        if isinstance(__key, int):
+            return Index(self, __key)
+
+        if isinstance(__key, str):
+            return Key(self, __key)
+
+        return Void(self)
 
     @abstractmethod
     def __copy__(self) -> Self:
         raise NotImplementedError
 
+    @final
+    def __reduce__(self) -> tuple[Any, ...]:
+        # The caches hold closures, so only the definition of the pattern is
+        # kept: combinators refer to their sources, and functions are pickled
+        # by name. Slots are read through their descriptors, as combinators
+        # forward missing attributes to their sources.
+        slots: dict[str, Any] = {}
+        for cls in type(self).__mro__:
+            for slot in vars(cls).get("__slots__", ()):
+                if slot not in self._CACHES:
+                    try:
+                        slots[slot] = vars(cls)[slot].__get__(self)
+                    except AttributeError:
+                        pass
+
+        attributes = getattr(self, "__dict__", None)
+        return (__newobj__, (type(self),), (attributes, slots))
+
     @overload
     def __or__(self, __pattern: None) -> Self:
         ...
@@ -63,35 +231,33 @@ class Pattern(ABC):
     @final
     def __or__(self, __pattern: _T1 | None) -> Self | _T1:
         if __pattern is None:
+            return Optional(self)  # type: ignore[return-value]
 
-            def new_apply(_, document: Document) -> Iterable[Document]:
-                results = iter(self.apply(document))
-
-                try:
-                    yield next(results)
-                except StopIteration:
-                    yield None
-                    return
-
-                yield from results
-
-        else:
+        if (union := self._union(__pattern)) is not None:
+            return union  # type: ignore[return-value]
 
-            def new_apply(_, document: Document) -> Iterable[Document]:
-                yield from self.apply(document)
-                yield from __pattern.apply(document)
-
-        return self._updated(new_apply)
+        return Alt(self, __pattern)  # type: ignore[return-value]
 
     @final
-    def __get__(self, __instance: Pattern, __owner: type[Pattern]) -> Self:
-        parent = __instance[getattr(self, "name")]
+    def __get__(
+        self,
+        __instance: Pattern | None,
+        __owner: type[Pattern],
+    ) -> Self:
+        if __instance is None:
+            return self
 
-        def new_apply(_, document: Document) -> Iterable[Document]:
-            for result in parent.apply(document):
-                yield from self.apply(result)
+        # Bound fields are cached on the instance they were read from.
+        try:
+            fields = __instance._fields
+        except AttributeError:
+            fields = __instance._fields = {}
 
-        return self._updated(new_apply)
+        if (field := fields.get(self)) is None:
+            parent = __instance[getattr(self, "name")]
+            field = fields[self] = Field(self, parent)
+
+        return field  # type: ignore[return-value]
 
     @final
     def __set_name__(self, __owner: type, __name: str) -> None:
@@ -100,29 +266,82 @@ class Pattern(ABC):
 
     @final
     def __lshift__(self, __function: Callable[[Document], Document]) -> Self:
-        def new_apply(_, document: Document) -> Iterable[Document]:
-            yield from self.apply(__function(document))
-
-        return self._updated(new_apply)
+        return Pre(self, __function)  # type: ignore[return-value]
 
     @final
     def __rshift__(self, __function: Callable[[Document], Document]) -> Self:
-        def new_apply(_, document: Document) -> Iterable[Document]:
-            for result in self.apply(document):
-                yield __function(result)
+        return Post(self, __function)  # type: ignore[return-value]
+
+    @final
+    @property
+    def deterministic(self) -> bool:
+        return self._single() is not None
+
+    @final
+    @property
+    def projection(self) -> Projection:
+        return self._projection()
+
+    @final
+    def _single(self) -> Single | None:
+        try:
+            return self._single_function
+        except AttributeError:
+            self._single_function = self._make_single()
+            return self._single_function
 
-        return self._updated(new_apply)
+    def _make_single(self) -> Single | None:
+        return None
 
     @final
-    def _updated(
+    def compile(self) -> Matcher:
+        return Compiler().compile(self)
+
+    def _emit(
         self,
-        apply: Callable[[Self, Document], Iterable[Document]],
-    ) -> Self:
-        new = copy(self)
-        if "name" in self.__dict__:
-            new.name = self.name
-        new.apply = MethodType(apply, new)
-        return new
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        pattern = compiler.constant(self)
+        result = compiler.variable("result")
+        with compiler.loop(f"for {result} in {pattern}.apply({source}):"):
+            then(result)
+
+    def _count(self, document: Document) -> int:
+        return sum(1 for _ in self.apply(document))
+
+    def _nth(self, document: Document, index: int) -> Document:
+        return next(islice(self.apply(document), index, None))
+
+    def _selects(self, document: Document, key: int | str) -> bool | None:
+        # Whether every result (True) or no result (False) has the item
+        # `result[key]`; None if that is only known by enumerating results.
+        return None
+
+    def _accepts_each(self, items: list[Document]) -> bool:
+        # Whether every item is its own and only result, so that a list of
+        # them can be matched in bulk; False if that is not known cheaply.
+        return False
+
+    def _union(self, other: Pattern) -> Pattern | None:
+        # A single pattern with the results of `self | other`, if any.
+        return None
+
+    def _projection(self) -> Projection:
+        return None
+
+    def _rejects_none(self) -> bool:
+        # Whether the pattern surely has no result for None, i.e. for the
+        # value of a missing key.
+        return False
+
+    def _literals(self) -> frozenset[Document] | None:
+        # The values that the pattern accepts besides lists, if only a few.
+        return None
+
+    def _discriminants(self) -> Discriminants | None:
+        return None
 
     @final
     @staticmethod
@@ -139,3 +358,573 @@ class Pattern(ABC):
             yield from apply(self, document)
 
         return new_apply
+
+    @final
+    @staticmethod
+    def lift_single(single: Single) -> Single:
+        def new_single(document: Document) -> Document:
+            if isinstance(document, list):
+                found = NOTHING
+                for item in document:
+                    if (result := single(item)) is not NOTHING:
+                        if found is not NOTHING:
+                            raise AmbiguousMatch
+                        found = result
+                return found
+
+            return single(document)
+
+        return new_single
+
+    @final
+    @staticmethod
+    def memoize(
+        apply: Callable[[_T1, Document], Iterable[_T2]],
+    ) -> Callable[[_T1, Document], Iterable[Document]]:
+        # Also takes the fast path of `fast_path`, so that the memo is read
+        # once per call. Only lists and dicts can be shared through YAML
+        # aliases; other documents take the fast path even when memoized.
+        @wraps(apply)
+        def new_apply(self: _T1, document: Document) -> Iterable[Document]:
+            if (memo := memo_table.get()) is not None:
+                if isinstance(document, (list, dict)):
+                    key = (self, id(document))
+                    if (entry := memo.get(key)) is None:
+                        results = tuple(apply(self, document))
+                        entry = memo[key] = (document, results)
+                    return entry[1]
+
+            if single := self._single():
+                try:
+                    result = single(document)
+                except AmbiguousMatch:
+                    pass
+                else:
+                    return () if result is NOTHING else (result,)
+
+            return apply(self, document)
+
+        return new_apply
+
+    @final
+    @staticmethod
+    def fast_path(
+        apply: Callable[[_T1, Document], Iterable[_T2]],
+    ) -> Callable[[_T1, Document], Iterable[_T2]]:
+        # Patterns that yield at most one result skip the generators.
+        @wraps(apply)
+        def new_apply(self: _T1, document: Document) -> Iterable[_T2]:
+            if single := self._single():
+                # Memoized calls take the generator path, which consults
+                # the memo; only lists and dicts are memoized.
+                if memo_table.get() is None or not isinstance(
+                    document,
+                    (list, dict),
+                ):
+                    try:
+                        result = single(document)
+                    except AmbiguousMatch:
+                        pass
+                    else:
+                        return () if result is NOTHING else (result,)
+
+            return apply(self, document)
+
+        return new_apply
+
+
+class Combinator(Pattern):
+    # A pattern built by an operator on top of its source pattern. It reads
+    # like its source: fields and `repr` are taken from the underlying one.
+    __slots__ = ("_source",)
+
+    def __init__(self, source: Pattern) -> None:
+        self._source = source
+
+    @final
+    def __getattr__(self, __name: str) -> Any:
+        if __name.startswith("_"):
+            raise AttributeError(__name)
+
+        origin = self._origin
+        field = getattr(type(origin), __name, None)
+        if isinstance(field, Pattern):
+            return field.__get__(self, type(origin))
+
+        return getattr(origin, __name)
+
+    @final
+    @property
+    def _origin(self) -> Pattern:
+        source = self._source
+        while isinstance(source, Combinator):
+            source = source._source
+
+        return source
+
+    @abstractmethod
+    def _arguments(self) -> tuple[Any, ...]:
+        raise NotImplementedError
+
+    @final
+    def __copy__(self) -> Self:
+        return type(self)(*self._arguments())
+
+    @final
+    def __repr__(self) -> str:
+        return repr(self._source)
+
+
+class Access(Combinator):
+    __slots__ = ("_key",)
+
+    def __init__(self, source: Pattern, key: Any) -> None:
+        super().__init__(source)
+        self._key = key
+
+    @final
+    def _arguments(self) -> tuple[Any, ...]:
+        return (self._source, self._key)
+
+    @final
+    def _count(self, document: Document) -> int:
+        selects = self._source._selects(document, self._key)
+        if selects is None:
+            return super()._count(document)
+
+        return self._source.count(document) if selects else 0
+
+    @final
+    def _nth(self, document: Document, index: int) -> Document:
+        if self._source._selects(document, self._key):
+            return self._source._nth(document, index)[self._key]
+
+        return super()._nth(document, index)
+
+    @final
+    def _projection(self) -> Projection:
+        return self._source._projection()
+
+    @final
+    def _rejects_none(self) -> bool:
+        return self._source._rejects_none()
+
+
+@final
+class Index(Access):
+    __slots__ = ()
+
+    @Pattern.fast_path
+    def apply(self, document: Document) -> Iterable[Document]:
+        for result in self._source.apply(document):
+            if isinstance(result, list):
+                if -len(result) <= self._key < len(result):
+                    yield result[self._key]
+
+    def _make_single(self) -> Single | None:
+        if (single := self._source._single()) is None:
+            return None
+
+        index = self._key
+
+        def index_single(document: Document) -> Document:
+            result = single(document)
+            if isinstance(result, list):
+                if -len(result) <= index < len(result):
+                    return result[index]
+            return NOTHING
+
+        return index_single
+
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        def then_index(result: str) -> None:
+            with compiler.block(
+                f"if isinstance({result}, list)"
+                f" and -len({result}) <= {self._key!r} < len({result}):",
+            ):
+                then(compiler.assign(f"{result}[{self._key!r}]"))
+
+        compiler.emit(self._source, source, then_index)
+
+
+@final
+class Key(Access):
+    __slots__ = ()
+
+    @Pattern.fast_path
+    def apply(self, document: Document) -> Iterable[Document]:
+        for result in self._source.apply(document):
+            if isinstance(result, dict):
+                if self._key in result:
+                    yield result[self._key]
+
+    def _make_single(self) -> Single | None:
+        if (single := self._source._single()) is None:
+            return None
+
+        key = self._key
+
+        def key_single(document: Document) -> Document:
+            result = single(document)
+            if isinstance(result, dict):
+                if key in result:
+                    return result[key]
+            return NOTHING
+
+        return key_single
+
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        def then_key(result: str) -> None:
+            key = compiler.constant(self._key)
+            with compiler.block(
+                f"if isinstance({result}, dict) and {key} in {result}:",
+            ):
+                then(compiler.assign(f"{result}[{key}]"))
+
+        compiler.emit(self._source, source, then_key)
+
+
+@final
+class Void(Combinator):
+    # Access with a key that is neither an index nor a key.
+    __slots__ = ()
+
+    def apply(self, document: Document) -> Iterable[Document]:
+        return ()
+
+    def _arguments(self) -> tuple[Any, ...]:
+        return (self._source,)
+
+    def _make_single(self) -> Single | None:
+        return lambda document: NOTHING
+
+    def _count(self, document: Document) -> int:
+        return 0
+
+    def _projection(self) -> Projection:
+        return {}
+
+    def _rejects_none(self) -> bool:
+        return True
+
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        pass
+
+
+@final
+class Alt(Combinator):
+    __slots__ = ("_other", "_table")
+
+    _CACHES = Pattern._CACHES | {"_table"}
+
+    if TYPE_CHECKING:
+        _table: DispatchTable | None
+
+    def __init__(self, source: Pattern, other: Pattern) -> None:
+        super().__init__(source)
+        self._other = other
+
+    @Pattern.fast_path
+    def apply(self, document: Document) -> Iterable[Document]:
+        if isinstance(document, dict) and (table := self._dispatch()):
+            for branch in table.candidates(document):
+                yield from branch.apply(document)
+            return
+
+        yield from self._source.apply(document)
+        yield from self._other.apply(document)
+
+    def _arguments(self) -> tuple[Any, ...]:
+        return (self._source, self._other)
+
+    def _union(self, other: Pattern) -> Pattern | None:
+        # `(a | b) | c` has the results of `a | (b | c)`, so a trailing run
+        # of literals still folds.
+        if (union := self._other._union(other)) is None:
+            return None
+
+        return Alt(self._source, union)
+
+    def _dispatch(self) -> DispatchTable | None:
+        try:
+            return self._table
+        except AttributeError:
+            self._table = DispatchTable.build(list(self._branches()))
+            return self._table
+
+    def _branches(self) -> Iterator[Pattern]:
+        for pattern in (self._source, self._other):
+            if isinstance(pattern, Alt):
+                yield from pattern._branches()
+            else:
+                yield pattern
+
+    def _projection(self) -> Projection:
+        return merge(self._source._projection(), self._other._projection())
+
+    def _rejects_none(self) -> bool:
+        return self._source._rejects_none() and self._other._rejects_none()
+
+    def _literals(self) -> frozenset[Document] | None:
+        if (literals := self._source._literals()) is None:
+            return None
+
+        if (others := self._other._literals()) is None:
+            return None
+
+        return literals | others
+
+    def _count(self, document: Document) -> int:
+        return self._source.count(document) + self._other.count(document)
+
+    def _nth(self, document: Document, index: int) -> Document:
+        if index < (count := self._source.count(document)):
+            return self._source._nth(document, index)
+
+        return self._other._nth(document, index - count)
+
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        compiler.emit(self._source, source, then)
+        compiler.emit(self._other, source, then)
+
+
+@final
+class Optional(Combinator):
+    __slots__ = ()
+
+    @Pattern.fast_path
+    def apply(self, document: Document) -> Iterable[Document]:
+        results = iter(self._source.apply(document))
+
+        try:
+            yield next(results)
+        except StopIteration:
+            yield None
+            return
+
+        yield from results
+
+    def _arguments(self) -> tuple[Any, ...]:
+        return (self._source,)
+
+    def _make_single(self) -> Single | None:
+        if (single := self._source._single()) is None:
+            return None
+
+        def optional_single(document: Document) -> Document:
+            result = single(document)
+            return None if result is NOTHING else result
+
+        return optional_single
+
+    def _count(self, document: Document) -> int:
+        return self._source.count(document) or 1
+
+    def _nth(self, document: Document, index: int) -> Document:
+        if self._source.count(document):
+            return self._source._nth(document, index)
+
+        return None
+
+    def _projection(self) -> Projection:
+        return self._source._projection()
+
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        found = compiler.variable("found")
+        compiler.line(f"{found} = False")
+
+        def then_optional(result: str) -> None:
+            compiler.line(f"{found} = True")
+            then(result)
+
+        compiler.emit(self._source, source, then_optional)
+        with compiler.block(f"if not {found}:"):
+            then(compiler.assign("None"))
+
+
+@final
+class Pre(Combinator):
+    __slots__ = ("_function",)
+
+    def __init__(
+        self,
+        source: Pattern,
+        function: Callable[[Document], Document],
+    ) -> None:
+        super().__init__(source)
+        self._function = function
+
+    # Callbacks have no single-result function: a fallback after
+    # AmbiguousMatch would run them again. The source still takes its own
+    # fast path on the transformed document.
+    def apply(self, document: Document) -> Iterable[Document]:
+        yield from self._source.apply(self._function(document))
+
+    def _arguments(self) -> tuple[Any, ...]:
+        return (self._source, self._function)
+
+    def _count(self, document: Document) -> int:
+        return self._source.count(self._function(document))
+
+    def _nth(self, document: Document, index: int) -> Document:
+        return self._source._nth(self._function(document), index)
+
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        function = compiler.constant(self._function)
+        compiler.emit(
+            self._source,
+            compiler.assign(f"{function}({source})"),
+            then,
+        )
+
+
+@final
+class Post(Combinator):
+    __slots__ = ("_function",)
+
+    def __init__(
+        self,
+        source: Pattern,
+        function: Callable[[Document], Document],
+    ) -> None:
+        super().__init__(source)
+        self._function = function
+
+    # No single-result function either, see `Pre`.
+    def apply(self, document: Document) -> Iterable[Document]:
+        for result in self._source.apply(document):
+            yield self._function(result)
+
+    def _arguments(self) -> tuple[Any, ...]:
+        return (self._source, self._function)
+
+    def _count(self, document: Document) -> int:
+        return self._source.count(document)
+
+    def _nth(self, document: Document, index: int) -> Document:
+        return self._function(self._source._nth(document, index))
+
+    def _projection(self) -> Projection:
+        return self._source._projection()
+
+    def _rejects_none(self) -> bool:
+        return self._source._rejects_none()
+
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        function = compiler.constant(self._function)
+        compiler.emit(
+            self._source,
+            source,
+            lambda result: then(compiler.assign(f"{function}({result})")),
+        )
+
+
+@final
+class Field(Combinator):
+    # A field pattern read from an instance: `parent` selects the value of
+    # the field from the instance, which the source pattern then matches.
+    __slots__ = ("_parent",)
+
+    def __init__(self, source: Pattern, parent: Pattern) -> None:
+        super().__init__(source)
+        self._parent = parent
+
+    @Pattern.fast_path
+    def apply(self, document: Document) -> Iterable[Document]:
+        for result in self._parent.apply(document):
+            yield from self._source.apply(result)
+
+    def _arguments(self) -> tuple[Any, ...]:
+        return (self._source, self._parent)
+
+    def _make_single(self) -> Single | None:
+        if (single := self._source._single()) is None:
+            return None
+
+        if (parent := self._parent._single()) is None:
+            return None
+
+        def field_single(document: Document) -> Document:
+            result = parent(document)
+            return NOTHING if result is NOTHING else single(result)
+
+        return field_single
+
+    def _count(self, document: Document) -> int:
+        results = self._parent.apply(document)
+        return sum(self._source.count(result) for result in results)
+
+    def _projection(self) -> Projection:
+        return self._parent._projection()
+
+    def _rejects_none(self) -> bool:
+        return self._parent._rejects_none()
+
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        compiler.emit(
+            self._parent,
+            source,
+            lambda result: compiler.emit(self._source, result, then),
+        )
+
+
+def _resumed(
+    start: Callable[[], Iterable[Document]],
+    variable: ContextVar[_T3],
+    value: _T3,
+) -> Iterator[Document]:
+    # Nested generators resume inside each `next` call here, so setting the
+    # variable around it makes every pattern below see the value.
+    results: Iterator[Document] | None = None
+    while True:
+        token = variable.set(value)
+        try:
+            if results is None:
+                results = iter(start())
+            result = next(results)
+        except StopIteration:
+            return
+        finally:
+            variable.reset(token)
+
+        yield result
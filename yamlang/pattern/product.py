@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from collections.abc import Iterator
+from contextvars import ContextVar
+from itertools import product
+from typing import Any
+
+# Whether containers enumerate combinations lazily; see `Pattern.apply_lazy`.
+lazy_mode: ContextVar[bool] = ContextVar("lazy_mode", default=False)
+
+
+def lazy_product(*iterables: Iterable[Any]) -> Iterator[tuple[Any, ...]]:
+    # Same order as `itertools.product`, but each input is only advanced
+    # when a combination needs its next value.
+    iterators: list[Iterator[Any] | None] = [iter(it) for it in iterables]
+    pools: list[list[Any]] = [[] for _ in iterators]
+    indices = [0] * len(pools)
+
+    def fetch(position: int, index: int) -> bool:
+        pool = pools[position]
+        if index < len(pool):
+            return True
+
+        if (iterator := iterators[position]) is not None:
+            for value in iterator:
+                pool.append(value)
+                return True
+            iterators[position] = None
+
+        return False
+
+    for position in range(len(pools)):
+        if not fetch(position, 0):
+            return
+
+    yield tuple(pool[0] for pool in pools)
+
+    while True:
+        for position in reversed(range(len(pools))):
+            if fetch(position, indices[position] + 1):
+                indices[position] += 1
+                break
+            indices[position] = 0
+        else:
+            return
+
+        yield tuple(pool[index] for pool, index in zip(pools, indices))
+
+
+def cartesian_product(*iterables: Iterable[Any]) -> Iterator[tuple[Any, ...]]:
+    if lazy_mode.get():
+        return lazy_product(*iterables)
+
+    return product(*iterables)
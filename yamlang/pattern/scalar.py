@@ -1,15 +1,28 @@
 from __future__ import annotations
 
+import re
 from abc import abstractmethod
+from collections.abc import Callable
 from collections.abc import Iterable
+from math import isnan
+from typing import TYPE_CHECKING
+from typing import Any
 from typing import Generic
 from typing import Self
 from typing import final
 
 from typing_extensions import TypeVar
 
+from yamlang.pattern.compiler import Compiler
+from yamlang.pattern.compiler import Continuation
+from yamlang.pattern.pattern import NOTHING
 from yamlang.pattern.pattern import Pattern
+from yamlang.pattern.pattern import Single
 from yamlang.yamltools import Document
+from yamlang.yamltools import Projection
+
+# Marks the end of an affix in a trie, where all other keys are characters.
+_END = ""
 
 _T = TypeVar(
     "_T",
@@ -24,6 +37,9 @@ _T = TypeVar(
 
 
 class ScalarPattern(Pattern, Generic[_T]):
+    _accepts: Callable[[Document], bool] | None = None
+    _type: type | None = None
+
     @final
     def __init__(self, value: _T | None = None) -> None:
         self._value = value
@@ -36,13 +52,99 @@ class ScalarPattern(Pattern, Generic[_T]):
     def __copy__(self) -> Self:
         return type(self)(self._value)
 
+    @final
+    @classmethod
+    def one_of(cls, values: Iterable[_T]) -> OneOf[_T]:
+        return OneOf(cls(), tuple(values))
+
+    @final
+    def _union(self, other: Pattern) -> Pattern | None:
+        if self._value is None:
+            return None
+
+        return OneOf(type(self)(), (self._value,))._union(other)
+
+    @final
+    def _emit_lifted(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+        check: str,
+    ) -> None:
+        with compiler.lifted(source) as item:
+            condition = check.format(item=item)
+            if self._value is not None:
+                value = compiler.constant(self._value)
+                condition += f" and {item} == {value}"
+
+            with compiler.block(f"if {condition}:"):
+                then(item)
+
+    @final
+    def _make_single(self) -> Single | None:
+        if (accepts := self._accepts) is None:
+            return None
+
+        def scalar_single(document: Document) -> Document:
+            return document if accepts(document) else NOTHING
+
+        return Pattern.lift_single(scalar_single)
+
+    @final
+    def _accepts_each(self, items: list[Document]) -> bool:
+        # Exact types leave out nested lists, and booleans for integers.
+        if not set(map(type, items)) <= {self._type}:
+            return False
+
+        return self._value is None or items.count(self._value) == len(items)
+
+    @final
+    def _selects(self, document: Document, key: int | str) -> bool:
+        return False
+
+    @final
+    def _rejects_none(self) -> bool:
+        return True
+
+    @final
+    def _projection(self) -> Projection:
+        return {}
+
+    @final
+    def _literals(self) -> frozenset[Document] | None:
+        if self._value is None:
+            return None
+
+        return frozenset((self._value,))
+
     @final
     def __repr__(self) -> str:
         return f"{type(self).__name__}: {self._value!r}"
 
 
+class NumberPattern(ScalarPattern[_T]):
+    @final
+    @classmethod
+    def min(cls, bound: _T) -> RangePattern[_T]:
+        return RangePattern(cls(), bound, None)
+
+    @final
+    @classmethod
+    def max(cls, bound: _T) -> RangePattern[_T]:
+        return RangePattern(cls(), None, bound)
+
+    @final
+    @classmethod
+    def in_range(cls, min: _T, max: _T) -> RangePattern[_T]:
+        return RangePattern(cls(), min, max)
+
+
 @final
 class BoolPattern(ScalarPattern[bool]):
+    _type = bool
+
+    @Pattern.memoize
     @Pattern.lift
     def apply(self, document: Document) -> Iterable[bool]:
         if not isinstance(document, bool):
@@ -51,9 +153,26 @@ class BoolPattern(ScalarPattern[bool]):
         if self._value is None or document == self._value:
             yield document
 
+    def _accepts(self, document: Document) -> bool:
+        if not isinstance(document, bool):
+            return False
+
+        return self._value is None or document == self._value
+
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        self._emit_lifted(compiler, source, then, "isinstance({item}, bool)")
+
 
 @final
-class IntPattern(ScalarPattern[int]):
+class IntPattern(NumberPattern[int]):
+    _type = int
+
+    @Pattern.memoize
     @Pattern.lift
     def apply(self, document: Document) -> Iterable[int]:
         if not isinstance(document, int):
@@ -65,9 +184,34 @@ class IntPattern(ScalarPattern[int]):
         if self._value is None or document == self._value:
             yield document
 
+    def _accepts(self, document: Document) -> bool:
+        if not isinstance(document, int):
+            return False
+
+        if isinstance(document, bool):
+            return False
+
+        return self._value is None or document == self._value
+
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        self._emit_lifted(
+            compiler,
+            source,
+            then,
+            "isinstance({item}, int) and not isinstance({item}, bool)",
+        )
+
 
 @final
-class FloatPattern(ScalarPattern[float]):
+class FloatPattern(NumberPattern[float]):
+    _type = float
+
+    @Pattern.memoize
     @Pattern.lift
     def apply(self, document: Document) -> Iterable[float]:
         if not isinstance(document, float):
@@ -76,9 +220,26 @@ class FloatPattern(ScalarPattern[float]):
         if self._value is None or document == self._value:
             yield document
 
+    def _accepts(self, document: Document) -> bool:
+        if not isinstance(document, float):
+            return False
+
+        return self._value is None or document == self._value
+
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        self._emit_lifted(compiler, source, then, "isinstance({item}, float)")
+
 
 @final
 class StrPattern(ScalarPattern[str]):
+    _type = str
+
+    @Pattern.memoize
     @Pattern.lift
     def apply(self, document: Document) -> Iterable[str]:
         if not isinstance(document, str):
@@ -86,3 +247,343 @@ class StrPattern(ScalarPattern[str]):
 
         if self._value is None or document == self._value:
             yield document
+
+    def _accepts(self, document: Document) -> bool:
+        if not isinstance(document, str):
+            return False
+
+        return self._value is None or document == self._value
+
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        self._emit_lifted(compiler, source, then, "isinstance({item}, str)")
+
+    @staticmethod
+    def regex(pattern: str | re.Pattern[str], flags: int = 0) -> RegexPattern:
+        return RegexPattern(re.compile(pattern, flags))
+
+    @staticmethod
+    def prefix(*prefixes: str) -> AffixPattern:
+        return AffixPattern(prefixes, reverse=False)
+
+    @staticmethod
+    def suffix(*suffixes: str) -> AffixPattern:
+        return AffixPattern(suffixes, reverse=True)
+
+
+@final
+class OneOf(Pattern, Generic[_T]):
+    # The alternation of literals `kind(value) | ...` of the same kind, with
+    # one lookup per document instead of one generator per literal.
+    __slots__ = ("_kind", "_values", "_positions")
+
+    _CACHES = Pattern._CACHES | {"_positions"}
+
+    if TYPE_CHECKING:
+        _positions: dict[Document, tuple[int, ...]]
+
+    def __init__(
+        self,
+        kind: ScalarPattern[_T],
+        values: tuple[_T, ...],
+    ) -> None:
+        self._kind = kind
+        self._values = values
+
+    @Pattern.memoize
+    def apply(self, document: Document) -> Iterable[_T]:
+        positions = self.__positions()
+        accepts = self._kind._accepts
+        assert accepts is not None
+
+        if not isinstance(document, list):
+            if accepts(document):
+                for _ in positions.get(document, ()):
+                    yield document  # type: ignore[misc]
+            return
+
+        # Like the alternation, yield the items per literal in turn.
+        matches = sorted(
+            (position, index)
+            for index, item in enumerate(document)
+            if accepts(item)
+            for position in positions.get(item, ())
+        )
+        for _, index in matches:
+            yield document[index]  # type: ignore[misc]
+
+    def __copy__(self) -> Self:
+        return OneOf(self._kind, self._values)
+
+    def _union(self, other: Pattern) -> Pattern | None:
+        if not isinstance(other, type(self._kind)):
+            if not isinstance(other, OneOf):
+                return None
+            if not isinstance(other._kind, type(self._kind)):
+                return None
+            return OneOf(self._kind, self._values + other._values)
+
+        assert isinstance(other, ScalarPattern)
+        if other._value is None:
+            return None
+
+        return OneOf(self._kind, (*self._values, other._value))
+
+    def _make_single(self) -> Single | None:
+        positions = self.__positions()
+        if len(positions) < len(self._values):
+            return None
+
+        accepts = self._kind._accepts
+        assert accepts is not None
+
+        def one_of_single(document: Document) -> Document:
+            if accepts(document) and document in positions:
+                return document
+            return NOTHING
+
+        return Pattern.lift_single(one_of_single)
+
+    def _count(self, document: Document) -> int:
+        positions = self.__positions()
+        accepts = self._kind._accepts
+        assert accepts is not None
+
+        return sum(
+            len(positions.get(item, ()))
+            for item in (
+                document if isinstance(document, list) else (document,)
+            )
+            if accepts(item)
+        )
+
+    def _accepts_each(self, items: list[Document]) -> bool:
+        if not set(map(type, items)) <= {self._kind._type}:
+            return False
+
+        positions = self.__positions()
+        if len(positions) < len(self._values):
+            return False
+
+        return positions.keys() >= set(items)
+
+    def _selects(self, document: Document, key: int | str) -> bool:
+        return False
+
+    def _rejects_none(self) -> bool:
+        return True
+
+    def _projection(self) -> Projection:
+        return {}
+
+    def _literals(self) -> frozenset[Document]:
+        return frozenset(self._values)
+
+    def __positions(self) -> dict[Document, tuple[int, ...]]:
+        # Built on first use, as `a | b | ...` folds one literal at a time.
+        try:
+            return self._positions
+        except AttributeError:
+            positions: dict[Document, tuple[int, ...]] = {}
+            for position, value in enumerate(self._values):
+                positions[value] = (*positions.get(value, ()), position)
+            self._positions = positions
+            return positions
+
+    def __repr__(self) -> str:
+        return f"{type(self._kind).__name__}: {self._values!r}"
+
+
+class StrShapePattern(Pattern):
+    # A string pattern that checks the shape of a string rather than its
+    # exact value.
+    @abstractmethod
+    def _accepts(self, document: str) -> bool:
+        raise NotImplementedError
+
+    @final
+    @Pattern.memoize
+    @Pattern.lift
+    def apply(self, document: Document) -> Iterable[str]:
+        if not isinstance(document, str):
+            return
+
+        if self._accepts(document):
+            yield document
+
+    @final
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        accepts = compiler.constant(self._accepts)
+        with compiler.lifted(source) as item:
+            with compiler.block(
+                f"if isinstance({item}, str) and {accepts}({item}):",
+            ):
+                then(item)
+
+    @final
+    def _make_single(self) -> Single | None:
+        accepts = self._accepts
+
+        def shape_single(document: Document) -> Document:
+            if isinstance(document, str) and accepts(document):
+                return document
+            return NOTHING
+
+        return Pattern.lift_single(shape_single)
+
+    @final
+    def _accepts_each(self, items: list[Document]) -> bool:
+        if not set(map(type, items)) <= {str}:
+            return False
+
+        return all(map(self._accepts, items))
+
+    @final
+    def _selects(self, document: Document, key: int | str) -> bool:
+        return False
+
+    @final
+    def _rejects_none(self) -> bool:
+        return True
+
+    @final
+    def _projection(self) -> Projection:
+        return {}
+
+
+@final
+class RegexPattern(StrShapePattern):
+    def __init__(self, regex: re.Pattern[str]) -> None:
+        self._regex = regex
+
+    def _accepts(self, document: str) -> bool:
+        return self._regex.fullmatch(document) is not None
+
+    def __copy__(self) -> Self:
+        return RegexPattern(self._regex)
+
+    def __repr__(self) -> str:
+        return f"StrPattern: {self._regex!r}"
+
+
+@final
+class AffixPattern(StrShapePattern):
+    # Matches strings that start (or, if `reverse`, end) with any of the
+    # affixes, which are merged into a trie of characters.
+    def __init__(self, affixes: Iterable[str], *, reverse: bool) -> None:
+        self._affixes = tuple(affixes)
+        self._reverse = reverse
+        self._trie: dict[str, Any] = {}
+        for affix in self._affixes:
+            node = self._trie
+            for char in reversed(affix) if reverse else affix:
+                node = node.setdefault(char, {})
+            node[_END] = None
+
+    def _accepts(self, document: str) -> bool:
+        node = self._trie
+        for char in reversed(document) if self._reverse else document:
+            if _END in node:
+                return True
+            if (node := node.get(char)) is None:
+                return False
+
+        return _END in node
+
+    def __copy__(self) -> Self:
+        return AffixPattern(self._affixes, reverse=self._reverse)
+
+    def __repr__(self) -> str:
+        kind = "suffix" if self._reverse else "prefix"
+        return f"StrPattern: {kind} {self._affixes!r}"
+
+
+@final
+class RangePattern(Pattern, Generic[_T]):
+    # Numbers of the kind between the bounds, both included when given.
+    def __init__(
+        self,
+        kind: NumberPattern[_T],
+        min: _T | None,
+        max: _T | None,
+    ) -> None:
+        self._kind = kind
+        self._min = min
+        self._max = max
+
+    @Pattern.memoize
+    @Pattern.lift
+    def apply(self, document: Document) -> Iterable[_T]:
+        if self._accepts(document):
+            yield document  # type: ignore[misc]
+
+    def __copy__(self) -> Self:
+        return RangePattern(self._kind, self._min, self._max)
+
+    def _accepts(self, document: Document) -> bool:
+        accepts = self._kind._accepts
+        assert accepts is not None
+
+        if not accepts(document):
+            return False
+
+        if self._min is not None and not document >= self._min:
+            return False
+
+        return self._max is None or document <= self._max
+
+    def _emit(
+        self,
+        compiler: Compiler,
+        source: str,
+        then: Continuation,
+    ) -> None:
+        accepts = compiler.constant(self._accepts)
+        with compiler.lifted(source) as item:
+            with compiler.block(f"if {accepts}({item}):"):
+                then(item)
+
+    def _make_single(self) -> Single | None:
+        accepts = self._accepts
+
+        def range_single(document: Document) -> Document:
+            return document if accepts(document) else NOTHING
+
+        return Pattern.lift_single(range_single)
+
+    def _accepts_each(self, items: list[Document]) -> bool:
+        if not items:
+            return True
+
+        if not set(map(type, items)) <= {self._kind._type}:
+            return False
+
+        # NaN compares false to everything, so `min` and `max` may miss it.
+        if self._kind._type is float and any(map(isnan, items)):
+            return False
+
+        if self._min is not None and not min(items) >= self._min:
+            return False
+
+        return self._max is None or max(items) <= self._max
+
+    def _selects(self, document: Document, key: int | str) -> bool:
+        return False
+
+    def _rejects_none(self) -> bool:
+        return True
+
+    def _projection(self) -> Projection:
+        return {}
+
+    def __repr__(self) -> str:
+        return f"{type(self._kind).__name__}: {self._min!r}..{self._max!r}"
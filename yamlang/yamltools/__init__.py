@@ -1,7 +1,16 @@
+from yamlang.yamltools.document.cache import DocumentCache  # noqa: F401
 from yamlang.yamltools.document.combinator import FoldMap  # noqa: F401
 from yamlang.yamltools.document.combinator import Map  # noqa: F401
 from yamlang.yamltools.document.document import Document  # noqa: F401
+from yamlang.yamltools.document.document import YamLangLoader  # noqa: F401
 from yamlang.yamltools.document.document import dump  # noqa: F401
+from yamlang.yamltools.document.document import dump_stream  # noqa: F401
+from yamlang.yamltools.document.document import load_file_stream  # noqa: F401
+from yamlang.yamltools.document.document import load_files  # noqa: F401
 from yamlang.yamltools.document.document import load_from_file  # noqa: F401
 from yamlang.yamltools.document.document import load_from_text  # noqa: F401
+from yamlang.yamltools.document.document import load_stream  # noqa: F401
 from yamlang.yamltools.document.document import patch_yaml_loader  # noqa: F401
+from yamlang.yamltools.document.document import use_libyaml  # noqa: F401
+from yamlang.yamltools.document.event import load_events  # noqa: F401
+from yamlang.yamltools.document.projection import Projection  # noqa: F401
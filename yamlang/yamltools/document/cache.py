@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import marshal
+import os
+from collections import OrderedDict
+from collections.abc import Callable
+from contextlib import suppress
+from hashlib import blake2b
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from threading import Lock
+from typing import Any
+
+from yamlang.yamltools.document.document import Document
+from yamlang.yamltools.document.projection import Projection
+
+# Bumped whenever the loaders read the same text into different documents.
+_VERSION = 1
+
+_SUFFIX = ".marshal"
+
+# The share of `max_bytes` that eviction trims the directory down to.
+_LOW_WATER = 0.8
+
+
+class DocumentCache:
+    # Keeps the documents loaded from files in a directory, keyed by the
+    # path, modification time and size of each file and how it was loaded.
+    # Recently used entries are also kept in memory, in their marshalled
+    # form, so that callers never share a document.
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        max_bytes: int = 1 << 30,
+        memory_bytes: int = 64 << 20,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+
+        self._lock = Lock()
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_size = 0
+        self._disk_size: int | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "directory": self.directory,
+            "max_bytes": self.max_bytes,
+            "memory_bytes": self.memory_bytes,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__init__(  # type: ignore[misc]
+            state["directory"],
+            max_bytes=state["max_bytes"],
+            memory_bytes=state["memory_bytes"],
+        )
+
+    def fetch(
+        self,
+        path: Path,
+        projection: Projection,
+        load: Callable[[], Document],
+    ) -> Document:
+        key = self._key(path, projection)
+
+        if (data := self._recall(key)) is not None:
+            return marshal.loads(data)
+
+        entry = self.directory / f"{key}{_SUFFIX}"
+        try:
+            data = entry.read_bytes()
+            document = marshal.loads(data)
+        except OSError:
+            pass
+        except (ValueError, EOFError, TypeError):
+            # A corrupt or foreign entry is a miss, and is replaced.
+            self._discard(key, entry)
+        else:
+            # A read-only cache still serves its entries.
+            with suppress(OSError):
+                os.utime(entry)
+            self._remember(key, data)
+            return document
+
+        data = marshal.dumps(load())
+        self._store(entry, data)
+        self._remember(key, data)
+        return marshal.loads(data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_size = 0
+            self._disk_size = None
+
+        for entry in self.directory.glob(f"*{_SUFFIX}"):
+            entry.unlink(missing_ok=True)
+
+    def _key(self, path: Path, projection: Projection) -> str:
+        stat = path.stat()
+        key = (
+            _VERSION,
+            marshal.version,
+            str(path.resolve()),
+            stat.st_mtime_ns,
+            stat.st_size,
+            _canonical(projection),
+        )
+        return blake2b(marshal.dumps(key), digest_size=20).hexdigest()
+
+    def _recall(self, key: str) -> bytes | None:
+        with self._lock:
+            if (data := self._memory.get(key)) is not None:
+                self._memory.move_to_end(key)
+            return data
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self.memory_bytes:
+            return
+
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = data
+            self._memory_size += len(data)
+            while self._memory_size > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_size -= len(evicted)
+
+    def _discard(self, key: str, entry: Path) -> None:
+        with self._lock:
+            if (data := self._memory.pop(key, None)) is not None:
+                self._memory_size -= len(data)
+            if self._disk_size is not None:
+                self._disk_size -= _size(entry)
+
+        with suppress(OSError):
+            entry.unlink(missing_ok=True)
+
+    def _store(self, entry: Path, data: bytes) -> None:
+        # A cache that cannot be written to never fails a load.
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            file = NamedTemporaryFile(
+                dir=self.directory,
+                suffix=".tmp",
+                delete=False,
+            )
+        except OSError:
+            return
+
+        # Written aside and moved in place, so readers never see a part.
+        try:
+            with file:
+                file.write(data)
+            os.replace(file.name, entry)
+        except OSError:
+            Path(file.name).unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            if self._disk_size is None:
+                self._disk_size = sum(map(_size, self._entries()))
+            else:
+                self._disk_size += len(data)
+            if self._disk_size <= self.max_bytes:
+                return
+
+            # Entries are touched when read, so the oldest go first. Some
+            # room is left, so that the next stores do not evict again.
+            low_water = int(self.max_bytes * _LOW_WATER)
+            entries = sorted(self._entries(), key=_mtime)
+            self._disk_size = sum(map(_size, entries))
+            for evicted in entries:
+                if self._disk_size <= low_water:
+                    break
+                self._disk_size -= _size(evicted)
+                evicted.unlink(missing_ok=True)
+
+    def _entries(self) -> list[Path]:
+        return list(self.directory.glob(f"*{_SUFFIX}"))
+
+
+def _canonical(projection: Projection) -> Any:
+    if projection is None:
+        return None
+
+    return tuple(
+        (key, _canonical(value)) for key, value in sorted(projection.items())
+    )
+
+
+def _size(entry: Path) -> int:
+    try:
+        return entry.stat().st_size
+    except OSError:
+        return 0
+
+
+def _mtime(entry: Path) -> int:
+    try:
+        return entry.stat().st_mtime_ns
+    except OSError:
+        return 0
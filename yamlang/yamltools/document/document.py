@@ -1,15 +1,47 @@
 from __future__ import annotations
 
+import re
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from functools import partial
+from itertools import islice
 from pathlib import Path
+from typing import IO
+from typing import TYPE_CHECKING
+from typing import Literal
 from typing import overload
 
 import yaml
 from typing_extensions import TypeVar
 
+from yamlang.yamltools.document.projection import Projection
+from yamlang.yamltools.document.projection import resolve
+
+if TYPE_CHECKING:
+    from yamlang.pattern.pattern import Pattern
+    from yamlang.yamltools.document.cache import DocumentCache
+
 Document = (
     None | bool | int | float | str | list["Document"] | dict[str, "Document"]
 )
 
+Executor = Literal["thread", "process"]
+
+_NULL_TAG = "tag:yaml.org,2002:null"
+_BOOL_TAG = "tag:yaml.org,2002:bool"
+_DATE_TAG = "tag:yaml.org,2002:timestamp"
+_SEQ_TAG = "tag:yaml.org,2002:seq"
+_MAP_TAG = "tag:yaml.org,2002:map"
+_MERGE_TAG = "tag:yaml.org,2002:merge"
+
+_NULL = re.compile(r"^(?:~|)$")
+_BOOL = re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$")
+
 
 def null_constructor(
     loader: yaml.Loader | yaml.FullLoader | yaml.UnsafeLoader,
@@ -65,11 +97,26 @@ def date_constructor(
     return loader.construct_scalar(node)
 
 
+# libyaml parses and emits several times faster, where it is available.
+_libyaml = yaml.__with_libyaml__
+
+
+# The cache of `load_files`, shipped once to every worker process.
+_cache: DocumentCache | None = None
+
+
+def use_libyaml(enabled: bool = True) -> None:
+    global _libyaml
+    _libyaml = enabled and yaml.__with_libyaml__
+
+
 def patch_yaml_loader(
     patch_null: bool = True,
     patch_bool: bool = True,
     patch_date: bool = True,
 ) -> None:
+    # Only needed to give the default loaders of PyYAML the semantics of
+    # `YamLangLoader`, which the loaders here use without patching.
     if patch_null:
         yaml.add_constructor("tag:yaml.org,2002:null", null_constructor)
 
@@ -80,26 +127,311 @@ def patch_yaml_loader(
         yaml.add_constructor("tag:yaml.org,2002:timestamp", date_constructor)
 
 
-def load_from_file(document: Document) -> Document:
+class YamLangLoader(yaml.FullLoader):
+    pass
+
+
+def _register(loader: type[yaml.FullLoader | yaml.CFullLoader]) -> None:
+    # `add_constructor` copies the table into the class, so other loaders
+    # keep the semantics of PyYAML.
+    loader.add_constructor(_NULL_TAG, null_constructor)
+    loader.add_constructor(_BOOL_TAG, bool_constructor)
+    loader.add_constructor(_DATE_TAG, date_constructor)
+
+    # Plain scalars that the constructors would read as strings are never
+    # resolved to their tags, so only explicit tags reach the constructors.
+    loader.yaml_implicit_resolvers = {
+        first: [
+            (tag, regexp)
+            for tag, regexp in resolvers
+            if tag not in (_NULL_TAG, _BOOL_TAG, _DATE_TAG)
+        ]
+        for first, resolvers in loader.yaml_implicit_resolvers.items()
+    }
+    loader.add_implicit_resolver(_NULL_TAG, _NULL, ["~", ""])
+    loader.add_implicit_resolver(_BOOL_TAG, _BOOL, list("tTfF"))
+
+
+_register(YamLangLoader)
+
+
+class _Projecting(yaml.constructor.BaseConstructor):
+    # Constructs only the branches of each composed document that the
+    # projection reaches; see `Pattern.projection`.
+    def __init__(self, stream: str | IO[str], projection: Projection) -> None:
+        super().__init__(stream)  # type: ignore[call-arg]
+        self.projection = projection
+        self.projected: dict[tuple[yaml.Node, int], yaml.Node] = {}
+
+    def construct_document(self, node: yaml.Node) -> Document:
+        try:
+            node = self.project(node, self.projection)
+        finally:
+            self.projected = {}
+        return super().construct_document(node)
+
+    def project(self, node: yaml.Node, projection: Projection) -> yaml.Node:
+        if projection is None:
+            return node
+
+        # Aliased nodes are projected once for each projection they are
+        # read with, which also ends the recursion on cyclic documents.
+        if (key := (node, id(projection))) in self.projected:
+            return self.projected[key]
+
+        if isinstance(node, yaml.SequenceNode) and node.tag == _SEQ_TAG:
+            items: list[yaml.Node] = []
+            self.projected[key] = yaml.SequenceNode(
+                node.tag,
+                items,
+                node.start_mark,
+                node.end_mark,
+                node.flow_style,
+            )
+            items.extend(self.project(item, projection) for item in node.value)
+
+        elif isinstance(node, yaml.MappingNode) and node.tag == _MAP_TAG:
+            entries: list[tuple[yaml.Node, yaml.Node]] = []
+            self.projected[key] = yaml.MappingNode(
+                node.tag,
+                entries,
+                node.start_mark,
+                node.end_mark,
+                node.flow_style,
+            )
+            for name, value in node.value:
+                if name.tag == _MERGE_TAG:
+                    entries.append((name, self.project(value, projection)))
+                    continue
+
+                # Keys tagged like `!!bool yes` are strings once constructed.
+                if not isinstance(name, yaml.ScalarNode):
+                    continue
+                text = self.construct_object(name)
+                if isinstance(text, str) and text in projection:
+                    entries.append(
+                        (name, self.project(value, projection[text])),
+                    )
+
+        else:
+            self.projected[key] = node
+
+        return self.projected[key]
+
+
+class _ProjectingLoader(_Projecting, YamLangLoader):
+    pass
+
+
+# The loaders and dumpers by whether they use libyaml.
+_LOADERS: dict[bool, type[yaml.FullLoader | yaml.CFullLoader]] = {
+    False: YamLangLoader,
+}
+_PROJECTING_LOADERS: dict[bool, type[_Projecting]] = {
+    False: _ProjectingLoader,
+}
+_DUMPERS: dict[bool, type[yaml.Dumper | yaml.CDumper]] = {False: yaml.Dumper}
+
+if yaml.__with_libyaml__:
+
+    class _CYamLangLoader(yaml.CFullLoader):
+        pass
+
+    class _CProjectingLoader(_Projecting, _CYamLangLoader):
+        pass
+
+    _register(_CYamLangLoader)
+    _LOADERS[True] = _CYamLangLoader
+    _PROJECTING_LOADERS[True] = _CProjectingLoader
+    _DUMPERS[True] = yaml.CDumper
+
+
+def _loader(
+    libyaml: bool | None = None,
+) -> type[yaml.FullLoader | yaml.CFullLoader]:
+    return _LOADERS[_libyaml if libyaml is None else libyaml]
+
+
+def _projecting_loader(libyaml: bool | None = None) -> type[_Projecting]:
+    return _PROJECTING_LOADERS[_libyaml if libyaml is None else libyaml]
+
+
+def _dumper() -> type[yaml.Dumper | yaml.CDumper]:
+    return _DUMPERS[_libyaml]
+
+
+def load_from_file(
+    document: Document,
+    projection: Projection | Pattern = None,
+    *,
+    workers: int = 1,
+    executor: Executor = "thread",
+    cache: DocumentCache | None = None,
+) -> Document:
+    projection = resolve(projection)
+
+    if isinstance(document, list):
+        if workers > 1:
+            files = load_files(
+                document,
+                projection,
+                workers=workers,
+                executor=executor,
+                cache=cache,
+            )
+            return [loaded for _, loaded in files]
+
+        return [
+            load_from_file(item, projection, cache=cache) for item in document
+        ]
+
+    return _load_file(document, projection, _libyaml, cache)
+
+
+def load_files(
+    documents: Iterable[Document],
+    projection: Projection | Pattern = None,
+    *,
+    workers: int = 1,
+    executor: Executor = "thread",
+    ordered: bool = True,
+    cache: DocumentCache | None = None,
+) -> Iterator[tuple[Document, Document]]:
+    # Yields each path with its document as soon as it is loaded, or in the
+    # order of the paths if `ordered`. Threads suit files that are mostly
+    # read, processes files that are mostly parsed.
+    if executor not in ("thread", "process"):
+        raise ValueError(f"unknown executor: {executor!r}")
+
+    projection = resolve(projection)
+
+    if workers <= 1:
+        for document in documents:
+            yield document, load_from_file(document, projection, cache=cache)
+        return
+
+    pool: ThreadPoolExecutor | ProcessPoolExecutor
+    if executor == "thread":
+        pool = ThreadPoolExecutor(workers)
+        load = partial(_load_file, cache=cache)
+    else:
+        # The cache keeps its disk size per instance, so every worker gets
+        # one instance rather than a fresh copy with every file.
+        pool = ProcessPoolExecutor(
+            workers,
+            initializer=_initialize,
+            initargs=(cache,),
+        )
+        load = _load_worker_file
+    paths = iter(documents)
+    pending: dict[Future[Document], Document] = {}
+    libyaml = _libyaml
+
+    def submit(document: Document) -> None:
+        future = pool.submit(load, document, projection, libyaml)
+        pending[future] = document
+
+    try:
+        # Keep a couple of files per worker in flight, so that a long or
+        # lazy list of paths is neither read nor loaded all at once.
+        for document in islice(paths, 2 * workers):
+            submit(document)
+
+        while pending:
+            if ordered:
+                done = [next(iter(pending))]
+            else:
+                done = list(wait(pending, return_when=FIRST_COMPLETED).done)
+
+            for future in done:
+                yield pending.pop(future), future.result()
+                for document in islice(paths, 1):
+                    submit(document)
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def _load_file(
+    document: Document,
+    projection: Projection,
+    libyaml: bool,
+    cache: DocumentCache | None,
+) -> Document:
+    # The backend is chosen by the caller: worker processes do not share it,
+    # and worker threads must not follow later changes to it.
     if isinstance(document, list):
-        return [load_from_file(item) for item in document]
+        return [
+            _load_file(item, projection, libyaml, cache) for item in document
+        ]
 
     path = Path(str(document))
 
-    if path.exists() or not path.is_file():
+    if not path.is_file():
         return
 
-    with path.open() as file:
-        return yaml.load(file.read(), Loader=yaml.FullLoader)
+    def load() -> Document:
+        with path.open() as file:
+            return _load(file.read(), projection, libyaml)
+
+    return load() if cache is None else cache.fetch(path, projection, load)
+
 
+def _initialize(cache: DocumentCache | None) -> None:
+    global _cache
+    _cache = cache
+
+
+def _load_worker_file(
+    document: Document,
+    projection: Projection,
+    libyaml: bool,
+) -> Document:
+    return _load_file(document, projection, libyaml, _cache)
+
+
+def load_from_text(
+    document: Document,
+    projection: Projection | Pattern = None,
+) -> Document:
+    projection = resolve(projection)
 
-def load_from_text(document: Document) -> Document:
     if isinstance(document, list):
-        return [load_from_text(item) for item in document]
+        return [load_from_text(item, projection) for item in document]
 
     text = str(document)
 
-    return yaml.load(text, Loader=yaml.FullLoader)
+    return _load(text, projection)
+
+
+def _load(
+    text: str,
+    projection: Projection,
+    libyaml: bool | None = None,
+) -> Document:
+    if projection is None:
+        return yaml.load(text, Loader=_loader(libyaml))
+
+    loader = _projecting_loader(libyaml)(text, projection)
+    try:
+        return loader.get_single_data()  # type: ignore[attr-defined]
+    finally:
+        loader.dispose()  # type: ignore[attr-defined]
+
+
+def load_stream(stream: str | IO[str]) -> Iterator[Document]:
+    # Documents separated by `---` are loaded one at a time, as the stream
+    # is read, so only the current document is held in memory.
+    yield from yaml.load_all(stream, Loader=_loader())
+
+
+def load_file_stream(document: Document) -> Iterator[Document]:
+    path = Path(str(document))
+
+    if not path.is_file():
+        return
+
+    with path.open() as file:
+        yield from load_stream(file)
 
 
 _T = TypeVar("_T", infer_variance=True)
@@ -116,6 +448,33 @@ def dump(document: Document, *, default: _T) -> str | _T:
 
 
 def dump(document: Document, *, default: _T | str = "") -> str | _T:
-    maybe_text = yaml.dump(document, sort_keys=False, default_flow_style=False)
+    maybe_text = yaml.dump(
+        document,
+        Dumper=_dumper(),
+        sort_keys=False,
+        default_flow_style=False,
+    )
 
     return str(maybe_text) if maybe_text else default
+
+
+def dump_stream(documents: Iterable[Document], file: IO[str]) -> int:
+    # Documents are written one at a time, each after a `---`, so only the
+    # current document is held in memory; see `load_stream`.
+    dumper = _dumper()(
+        file,
+        sort_keys=False,
+        default_flow_style=False,
+        explicit_start=True,
+    )
+    count = 0
+    try:
+        dumper.open()  # type: ignore[no-untyped-call]
+        for document in documents:
+            dumper.represent(document)  # type: ignore[no-untyped-call]
+            count += 1
+        dumper.close()  # type: ignore[no-untyped-call]
+    finally:
+        dumper.dispose()  # type: ignore[no-untyped-call]
+
+    return count
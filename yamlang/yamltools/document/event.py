@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from collections.abc import Hashable
+from collections.abc import Iterator
+from typing import IO
+from typing import TYPE_CHECKING
+
+import yaml
+
+from yamlang.yamltools.document.document import Document
+from yamlang.yamltools.document.document import YamLangLoader
+from yamlang.yamltools.document.document import _loader
+from yamlang.yamltools.document.projection import Projection
+from yamlang.yamltools.document.projection import resolve
+
+if TYPE_CHECKING:
+    from yamlang.pattern.pattern import Pattern
+
+_MERGE_TAG = "tag:yaml.org,2002:merge"
+_COLLECTION_TAGS = ("tag:yaml.org,2002:seq", "tag:yaml.org,2002:map")
+
+
+def load_events(
+    stream: str | IO[str],
+    projection: Projection | Pattern = None,
+) -> Iterator[Document]:
+    # Like `load_stream`, but builds each document right from the parser
+    # events and only as far as the projection reaches. Other subtrees are
+    # skipped event by event, unless they are anchored for later aliases.
+    builder = _EventBuilder(yaml.parse(stream, Loader=_loader()))
+    yield from builder.documents(resolve(projection))
+
+
+class _EventBuilder:
+    def __init__(self, events: Iterator[yaml.Event]) -> None:
+        self._events = events
+        # Scalars are resolved and constructed as the loader would do.
+        self._loader = YamLangLoader("")
+        self._anchors: dict[str, Document] = {}
+
+    def documents(self, projection: Projection) -> Iterator[Document]:
+        for event in self._events:
+            if isinstance(event, yaml.DocumentStartEvent):
+                self._anchors = {}
+                yield self._build(next(self._events), projection)
+
+    def _build(self, event: yaml.Event, projection: Projection) -> Document:
+        if isinstance(event, yaml.AliasEvent):
+            if event.anchor not in self._anchors:
+                raise yaml.composer.ComposerError(
+                    None,
+                    None,
+                    f"found undefined alias {event.anchor!r}",
+                    event.start_mark,
+                )
+            return self._anchors[event.anchor]
+
+        if (anchor := event.anchor) is not None:
+            if anchor in self._anchors:
+                raise yaml.composer.ComposerError(
+                    None,
+                    None,
+                    f"found duplicate anchor {anchor!r}",
+                    event.start_mark,
+                )
+            # An alias may read more of the node than this occurrence does.
+            projection = None
+
+        if isinstance(event, yaml.ScalarEvent):
+            value = self._scalar(event)
+            if anchor is not None:
+                self._anchors[anchor] = value
+            return value
+
+        if event.tag not in (None, "!", *_COLLECTION_TAGS):
+            raise yaml.constructor.ConstructorError(
+                None,
+                None,
+                f"cannot build a node tagged {event.tag!r} from events",
+                event.start_mark,
+            )
+
+        if isinstance(event, yaml.SequenceStartEvent):
+            items: list[Document] = []
+            if anchor is not None:
+                self._anchors[anchor] = items
+            for event in self._events:
+                if isinstance(event, yaml.SequenceEndEvent):
+                    return items
+                items.append(self._build(event, projection))
+
+        mapping: dict[str, Document] = {}
+        if anchor is not None:
+            self._anchors[anchor] = mapping
+
+        merged: dict[str, Document] = {}
+        entries: dict[str, Document] = {}
+        for event in self._events:
+            if isinstance(event, yaml.MappingEndEvent):
+                break
+
+            if self._is_merge(event):
+                merged.update(self._merge(next(self._events), projection))
+                continue
+
+            key = self._build(event, None)
+            if not isinstance(key, Hashable):
+                raise yaml.constructor.ConstructorError(
+                    "while constructing a mapping",
+                    None,
+                    "found unhashable key",
+                    event.start_mark,
+                )
+
+            if projection is None:
+                entries[key] = self._build(next(self._events), None)
+            elif isinstance(key, str) and key in projection:
+                value = self._build(next(self._events), projection[key])
+                entries[key] = value
+            else:
+                self._skip(next(self._events))
+
+        # Merged keys come first and give way to the keys of the mapping.
+        if projection is not None:
+            merged = {k: v for k, v in merged.items() if k in projection}
+        mapping.update(merged)
+        mapping.update(entries)
+        return mapping
+
+    def _merge(
+        self,
+        event: yaml.Event,
+        projection: Projection,
+    ) -> dict[str, Document]:
+        value = self._build(event, projection)
+        if isinstance(value, dict):
+            return value
+
+        if not isinstance(value, list) or not all(
+            isinstance(item, dict) for item in value
+        ):
+            raise yaml.constructor.ConstructorError(
+                "while constructing a mapping",
+                None,
+                "expected a mapping or list of mappings for merging",
+                event.start_mark,
+            )
+
+        # Earlier mappings in the list take precedence.
+        merged: dict[str, Document] = {}
+        for item in reversed(value):
+            merged.update(item)  # type: ignore[arg-type]
+        return merged
+
+    def _skip(self, event: yaml.Event) -> None:
+        if event.anchor is not None:
+            self._build(event, None)
+            return
+
+        if not isinstance(
+            event,
+            (yaml.SequenceStartEvent, yaml.MappingStartEvent),
+        ):
+            return
+
+        depth = 1
+        for event in self._events:
+            if isinstance(event, yaml.CollectionStartEvent):
+                if event.anchor is not None:
+                    self._build(event, None)
+                    continue
+                depth += 1
+            elif isinstance(event, yaml.CollectionEndEvent):
+                depth -= 1
+                if not depth:
+                    return
+            elif event.anchor is not None:
+                self._build(event, None)
+
+    def _scalar(self, event: yaml.ScalarEvent) -> Document:
+        node = yaml.ScalarNode(
+            self._tag(event),
+            event.value,
+            event.start_mark,
+            event.end_mark,
+            event.style,
+        )
+        return self._loader.construct_document(node)
+
+    def _is_merge(self, event: yaml.Event) -> bool:
+        return (
+            isinstance(event, yaml.ScalarEvent)
+            and event.value == "<<"
+            and self._tag(event) == _MERGE_TAG
+        )
+
+    def _tag(self, event: yaml.ScalarEvent) -> str:
+        if event.tag not in (None, "!"):
+            return event.tag
+
+        return self._loader.resolve(
+            yaml.ScalarNode,
+            event.value,
+            event.implicit,
+        )
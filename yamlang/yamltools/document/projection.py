@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from typing import Union
+
+if TYPE_CHECKING:
+    from yamlang.pattern.pattern import Pattern
+
+# The keys of the mappings in a document that are read, each with what is
+# read below it; None stands for the whole subtree. Sequences pass their
+# projection on to each of their items.
+Projection = Union[dict[str, "Projection"], None]
+
+
+def merge(first: Projection, second: Projection) -> Projection:
+    if first is None or second is None:
+        return None
+
+    merged = dict(first)
+    for key, projection in second.items():
+        if key in merged:
+            projection = merge(merged[key], projection)
+        merged[key] = projection
+
+    return merged
+
+
+def resolve(projection: Projection | Pattern) -> Projection:
+    # Patterns are read as the projection of the keys they access. They are
+    # told apart by that property, as the pattern package imports this one.
+    if projection is None or isinstance(projection, dict):
+        return projection
+
+    resolved = getattr(projection, "projection", projection)
+    if resolved is not None and not isinstance(resolved, dict):
+        raise TypeError(
+            "expected a projection or a pattern, "
+            f"got {type(projection).__name__}",
+        )
+
+    return resolved